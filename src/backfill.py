@@ -0,0 +1,298 @@
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, datetime, timedelta, timezone
+from email.utils import format_datetime
+from html.parser import HTMLParser
+from http.client import HTTPException
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from paths import DATA_DIR
+from rss_client import download
+from storage import add_history_many, flush, write_text
+from word_entry import WordEntry
+
+ARCHIVE_URL = "https://www.merriam-webster.com/word-of-the-day/{date}"
+CHECKPOINT_FILE = DATA_DIR / "backfill_checkpoint.json"
+# Defaults for politeness: parallel requests, and requests per second per host
+BACKFILL_WORKERS = 4
+BACKFILL_RATE = 1.0
+# Attempts per page before it is left for the next run
+BACKFILL_ATTEMPTS = 3
+# Parsed pages stored per add_history_many call (and checkpoint write)
+BACKFILL_BATCH = 50
+
+# Page element classes -> WordEntry field
+_PAGE_CLASSES = {
+    "word-header-txt": "word",
+    "word-syllables": "pronunciation",
+    "main-attr": "part_of_speech",
+    "wod-definition-container": "definition",
+    "did-you-know-wrapper": "did_you_know",
+}
+_INLINE_FIELDS = ("word", "pronunciation", "part_of_speech")
+_VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+
+class _ArchivePageParser(HTMLParser):
+    """Collect the word-of-the-day sections of an archive page.
+
+    Inline fields keep their first non-empty text. The definition and "Did
+    you know?" blocks are kept as (heading, paragraph) pairs, the heading
+    being the last <h2>/<h3> seen inside the block.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.inline: Dict[str, str] = {}
+        self.paragraphs: Dict[str, List[Tuple[str, str]]] = {"definition": [], "did_you_know": []}
+        self.canonical: Optional[str] = None
+        self._stack: List[Tuple[str, Optional[str]]] = []
+        self._text: Optional[List[str]] = None
+        self._text_tag = ""
+        self._heading = ""
+
+    def _field(self) -> Optional[str]:
+        for _, field in reversed(self._stack):
+            if field is not None:
+                return field
+        return None
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        attributes = dict(attrs)
+        if tag == "link" and attributes.get("rel") == "canonical":
+            self.canonical = attributes.get("href")
+        if tag in _VOID_TAGS:
+            return
+        classes = (attributes.get("class") or "").split()
+        field = next((_PAGE_CLASSES[c] for c in classes if c in _PAGE_CLASSES), None)
+        self._stack.append((tag, field))
+        current = self._field()
+        if self._text is None and current is not None:
+            if current in _INLINE_FIELDS and field is not None:
+                self._text, self._text_tag = [], tag
+            elif current in self.paragraphs and tag in ("p", "h2", "h3"):
+                self._text, self._text_tag = [], tag
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _VOID_TAGS or not any(t == tag for t, _ in self._stack):
+            return
+        field = self._field()
+        if self._text is not None and tag == self._text_tag:
+            text = " ".join("".join(self._text).split())
+            self._text = None
+            if field in _INLINE_FIELDS:
+                if text and field not in self.inline:
+                    self.inline[field] = text
+            elif tag == "p":
+                if text:
+                    self.paragraphs[field].append((self._heading, text))
+            else:
+                self._heading = text
+        # Pop up to the matching tag; unclosed children are dropped with it
+        while self._stack:
+            if self._stack.pop()[0] == tag:
+                break
+
+    def handle_data(self, data: str) -> None:
+        if self._text is not None:
+            self._text.append(data)
+
+
+def parse_archive_page(page: str, url: str, day: date) -> Optional[WordEntry]:
+    """Build a WordEntry from an archive page, or None if it has no word."""
+    parser = _ArchivePageParser()
+    parser.feed(page)
+    parser.close()
+    word = parser.inline.get("word", "")
+    if not word:
+        return None
+    definition = usage = ""
+    examples: List[str] = []
+    for heading, text in parser.paragraphs["definition"]:
+        if text.startswith("//"):
+            if not usage:
+                usage = text.lstrip("/ ").strip()
+        elif "context" in heading.lower():
+            examples.append(text)
+        elif not definition:
+            definition = text
+    did_you_know = " ".join(text for _, text in parser.paragraphs["did_you_know"])
+    return WordEntry(
+        word=word,
+        pronunciation=parser.inline.get("pronunciation", ""),
+        part_of_speech=parser.inline.get("part_of_speech", ""),
+        definition=definition,
+        short_definition="",
+        usage_example=usage,
+        examples=" ".join(examples),
+        did_you_know=did_you_know,
+        # Same layout as the feed's pubDate
+        published=format_datetime(datetime(day.year, day.month, day.day, tzinfo=timezone.utc)),
+        link=parser.canonical or url,
+    )
+
+
+class RateLimiter:
+    """Space requests to each host at least 1 / rate seconds apart.
+
+    Callers reserve the next free slot under the lock and sleep outside it,
+    so workers waiting on one host do not block each other's bookkeeping.
+    """
+
+    def __init__(self, rate: float) -> None:
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next: Dict[str, float] = {}
+
+    def wait(self, url: str) -> None:
+        if not self._interval:
+            return
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next.get(host, now))
+            self._next[host] = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def _days(start: date, end: date) -> Iterator[date]:
+    """Dates from end back to start, newest first like the feed."""
+    day = end
+    while day >= start:
+        yield day
+        day -= timedelta(days=1)
+
+
+def _load_checkpoint(path: Path) -> Set[str]:
+    try:
+        return set(json.loads(path.read_text(encoding="utf-8")).get("done", []))
+    except (OSError, ValueError, AttributeError):
+        return set()
+
+
+def _save_checkpoint(path: Path, done: Set[str]) -> None:
+    write_text(json.dumps({"done": sorted(done)}), path)
+
+
+def _fetch_day(day: date, base_url: str, limiter: RateLimiter) -> Tuple[date, Optional[WordEntry]]:
+    """Fetch and parse one archive page; (day, None) if there is no page for it."""
+    url = base_url.format(date=day.isoformat())
+    for attempt in range(BACKFILL_ATTEMPTS):
+        limiter.wait(url)
+        try:
+            _, headers, body = download(url)
+        except (OSError, HTTPException) as exc:
+            if getattr(exc, "code", None) == 404:
+                return day, None
+            if attempt == BACKFILL_ATTEMPTS - 1:
+                raise
+            time.sleep(2 ** attempt)
+            continue
+        charset = headers.get_content_charset() or "utf-8"
+        return day, parse_archive_page(body.decode(charset, "replace"), url, day)
+
+
+def backfill(
+    start: date,
+    end: date,
+    workers: int = BACKFILL_WORKERS,
+    rate: float = BACKFILL_RATE,
+    base_url: str = ARCHIVE_URL,
+    checkpoint: Path = CHECKPOINT_FILE,
+) -> Dict[str, int]:
+    """Fetch the archive pages from start to end into history.
+
+    Pages are fetched by a pool of workers under a per-host rate limit and
+    stored in batches of BACKFILL_BATCH. A day is written to the checkpoint
+    once its entry is stored, or once its page turns out not to exist, so
+    an interrupted run picks up where it stopped. Days that keep failing
+    are left out of the checkpoint and retried by the next run.
+
+    Returns counts of fetched, added, missing, failed and skipped days.
+    Raises ValueError if end is before start.
+    """
+    if end < start:
+        raise ValueError(f"end date {end} is before start date {start}")
+    done = _load_checkpoint(checkpoint)
+    todo = [day for day in _days(start, end) if day.isoformat() not in done]
+    stats = {"fetched": 0, "added": 0, "missing": 0, "failed": 0, "skipped": (end - start).days + 1 - len(todo)}
+    limiter = RateLimiter(rate)
+    batch: List[Tuple[date, WordEntry]] = []
+    batch_days: List[str] = []
+
+    def store() -> None:
+        # Batches go in newest first, the order add_history_many expects
+        batch.sort(key=lambda item: item[0], reverse=True)
+        stats["added"] += add_history_many(entry for _, entry in batch)
+        done.update(batch_days)
+        _save_checkpoint(checkpoint, done)
+        batch.clear()
+        batch_days.clear()
+
+    executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="verba-backfill")
+    # Keep a bounded number of pages in flight instead of queueing the whole range
+    pending = set()
+    days = iter(todo)
+    try:
+        while True:
+            for day in days:
+                pending.add(executor.submit(_fetch_day, day, base_url, limiter))
+                if len(pending) >= workers * 2:
+                    break
+            if not pending:
+                break
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                try:
+                    day, entry = future.result()
+                except Exception:
+                    # Out of attempts; the day stays unchecked for the next run
+                    stats["failed"] += 1
+                    continue
+                stats["fetched"] += 1
+                if entry is None:
+                    stats["missing"] += 1
+                else:
+                    batch.append((day, entry))
+                batch_days.append(day.isoformat())
+            if len(batch_days) >= BACKFILL_BATCH:
+                store()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        if batch_days:
+            store()
+        flush()
+    return stats
+
+
+def _parse_date(text: str) -> date:
+    return date.fromisoformat(text)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import argparse
+    parser = argparse.ArgumentParser(prog="backfill", description="Backfill history from the word-of-the-day archive.")
+    parser.add_argument("start", type=_parse_date, help="first day, YYYY-MM-DD")
+    parser.add_argument("end", type=_parse_date, nargs="?", default=date.today(), help="last day, YYYY-MM-DD (default: today)")
+    parser.add_argument("--workers", type=int, default=BACKFILL_WORKERS, help=f"parallel requests (default: {BACKFILL_WORKERS})")
+    parser.add_argument("--rate", type=float, default=BACKFILL_RATE, help=f"requests per second per host, 0 for no limit (default: {BACKFILL_RATE})")
+    parser.add_argument("--base-url", default=ARCHIVE_URL, help="archive page URL with a {date} placeholder")
+    parser.add_argument("--checkpoint", type=Path, default=CHECKPOINT_FILE, help=f"resume file (default: {CHECKPOINT_FILE})")
+    args = parser.parse_args(argv)
+    if args.end < args.start:
+        parser.error(f"end date {args.end} is before start date {args.start}")
+    try:
+        stats = backfill(args.start, args.end, args.workers, args.rate, args.base_url, args.checkpoint)
+    except KeyboardInterrupt:
+        print("Interrupted; progress is saved in the checkpoint.")
+        return
+    print(", ".join(f"{count} {name}" for name, count in stats.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import perf
+from paths import DATA_DIR
+from rss_client import FEED_URL, FeedParser, fetch_all_words, iter_rss_fields, parse_feed, strip_html
+from storage import word_key
+from word_entry import WordEntry
+
+# Optional registry of feeds, a JSON list of {"name", "url", "adapter"} objects
+FEEDS_FILE = DATA_DIR / "feeds.json"
+
+def parse_plain_rss(body: bytes, feed_url: str) -> Iterator[WordEntry]:
+    """Yield the items of a plain RSS 2.0 feed: the title is the word and
+    the description, stripped of markup, its definition."""
+    for fields in iter_rss_fields(body):
+        yield WordEntry(
+            word=fields.get("title") or "(unknown)",
+            pronunciation="",
+            part_of_speech="",
+            definition=strip_html(fields.get("description", "")),
+            short_definition="",
+            usage_example="",
+            examples="",
+            did_you_know="",
+            published=fields.get("pubDate", ""),
+            link=fields.get("link") or feed_url,
+        )
+
+
+# Adapter name -> parser turning a feed body into entries
+ADAPTERS: Dict[str, FeedParser] = {
+    "merriam-webster": parse_feed,
+    "rss": parse_plain_rss,
+}
+
+
+@dataclass(frozen=True)
+class Feed:
+    name: str
+    url: str
+    adapter: str = "merriam-webster"
+
+
+DEFAULT_FEEDS = (Feed("Merriam-Webster", FEED_URL),)
+
+
+def load_feeds() -> List[Feed]:
+    """Return the feeds listed in feeds.json, or DEFAULT_FEEDS without one.
+
+    Entries with no URL or an unknown adapter are skipped.
+    """
+    try:
+        items = json.loads(FEEDS_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return list(DEFAULT_FEEDS)
+    feeds = []
+    for item in items if isinstance(items, list) else []:
+        if not isinstance(item, dict) or not item.get("url"):
+            continue
+        feed = Feed(item.get("name") or item["url"], item["url"], item.get("adapter") or "merriam-webster")
+        if feed.adapter in ADAPTERS:
+            feeds.append(feed)
+    return feeds or list(DEFAULT_FEEDS)
+
+
+def _fetch_one(feed: Feed) -> List[WordEntry]:
+    """Fetch one feed, keeping the first (newest) entry of each word."""
+    seen = set()
+    entries = []
+    for entry in fetch_all_words(feed.url, ADAPTERS[feed.adapter]):
+        key = word_key(entry.word)
+        if key not in seen:
+            seen.add(key)
+            entries.append(entry)
+    return entries
+
+
+def merge_feeds(results: Iterable[Sequence[WordEntry]]) -> List[WordEntry]:
+    """Merge per-feed entry lists into one list, newest first.
+
+    A word found in several feeds is kept once, from the earliest feed in
+    results; the sort is stable, so entries with equal dates keep that order.
+    """
+    merged: Dict[str, WordEntry] = {}
+    for entries in results:
+        for entry in entries:
+            merged.setdefault(word_key(entry.word), entry)
+    return sorted(merged.values(), key=lambda entry: entry.published_at, reverse=True)
+
+
+@perf.timed("feeds.fetch")
+def fetch_feeds(feeds: Optional[Sequence[Feed]] = None) -> List[WordEntry]:
+    """Fetch every feed (load_feeds() by default) and merge the results.
+
+    Feeds are fetched in parallel, one thread each, over rss_client's pool
+    of keep-alive connections, so a refresh takes about as long as the
+    slowest feed. A feed that fails is left out of the result; if every
+    feed fails, the first error is raised.
+    """
+    feeds = load_feeds() if feeds is None else list(feeds)
+    if len(feeds) <= 1:
+        return merge_feeds(_fetch_one(feed) for feed in feeds)
+    with ThreadPoolExecutor(max_workers=len(feeds), thread_name_prefix="verba-feed") as executor:
+        futures = [executor.submit(_fetch_one, feed) for feed in feeds]
+    results = []
+    errors = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as exc:
+            perf.count("feeds.failed")
+            errors.append(exc)
+    if errors and not results:
+        raise errors[0]
+    return merge_feeds(results)
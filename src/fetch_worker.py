@@ -0,0 +1,74 @@
+import queue
+import threading
+from typing import Any, Callable, List, Optional, Tuple
+
+FetchResult = Tuple[Any, Optional[BaseException]]
+
+
+class FetchWorker:
+    """Run a blocking fetch off the Tk main thread.
+
+    Only one fetch is ever in flight: requests made while a fetch is running
+    are merged into it. Results are handed back through a queue that the UI
+    drains from an ``after()`` callback, so no Tk call happens off the main
+    thread.
+    """
+
+    def __init__(self, fetch: Callable[[], Any]) -> None:
+        self._fetch = fetch
+        self._results: "queue.Queue[FetchResult]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._in_flight = False
+        self._generation = 0
+
+    @property
+    def busy(self) -> bool:
+        with self._lock:
+            return self._in_flight
+
+    def request(self) -> bool:
+        """Start a fetch unless one is already running.
+
+        Returns True if a new fetch was started, False if the request was
+        coalesced into the one in flight.
+        """
+        with self._lock:
+            if self._in_flight:
+                return False
+            self._in_flight = True
+            generation = self._generation
+        thread = threading.Thread(target=self._run, args=(generation,), name="verba-fetch", daemon=True)
+        thread.start()
+        return True
+
+    def cancel(self) -> None:
+        """Discard the result of the fetch in flight, if any.
+
+        The network call itself cannot be interrupted; its thread is left to
+        finish and its result is dropped.
+        """
+        with self._lock:
+            self._generation += 1
+            self._in_flight = False
+
+    def poll(self) -> List[FetchResult]:
+        """Return every (result, error) pair delivered since the last poll."""
+        results = []
+        while True:
+            try:
+                results.append(self._results.get_nowait())
+            except queue.Empty:
+                return results
+
+    def _run(self, generation: int) -> None:
+        try:
+            result, error = self._fetch(), None
+        except Exception as exc:
+            result, error = None, exc
+        # Publish and clear the flag together so a poll that sees the worker
+        # idle is guaranteed to also see its result.
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._results.put((result, error))
+            self._in_flight = False
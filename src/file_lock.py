@@ -0,0 +1,78 @@
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import perf
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """Exclusive lock shared by every thread and process that uses path.
+
+    An advisory lock on a separate lock file: flock on POSIX, a one-byte
+    region lock on Windows. The file is opened once and kept open; a
+    thread lock serializes the threads of one process, which a single
+    descriptor would not. Not reentrant.
+
+    Time spent waiting is tallied in acquisitions, wait_total and wait_max.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._thread_lock = threading.Lock()
+        self._fd: Optional[int] = None
+        self.acquisitions = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def acquire(self) -> None:
+        start = time.perf_counter()
+        self._thread_lock.acquire()
+        try:
+            if self._fd is None:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+                self._fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            else:
+                while True:
+                    os.lseek(self._fd, 0, os.SEEK_SET)
+                    try:
+                        msvcrt.locking(self._fd, msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        # LK_LOCK gives up after about 10 seconds; keep waiting
+                        continue
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        waited = time.perf_counter() - start
+        self.acquisitions += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+        perf.observe("file_lock.wait_ms", waited * 1000)
+
+    def release(self) -> None:
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            self._thread_lock.release()
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.release()
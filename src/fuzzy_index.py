@@ -0,0 +1,109 @@
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Each edit changes at most this many of a word's trigrams
+_GRAMS_PER_EDIT = 3
+
+
+def trigrams(key: str) -> Set[str]:
+    """Return the padded trigrams of key, so word starts and ends count too."""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance between a and b, or limit + 1 once it exceeds limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb),
+            ))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class TrigramIndex:
+    """Typo-tolerant word lookup.
+
+    Words are indexed by their trigrams. A lookup only looks at words that
+    share enough trigrams with the query to be within the allowed edit
+    distance, and computes the distance for those alone, so its cost
+    follows the number of near matches rather than the vocabulary size.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # Normalized keys and the display words they came from, by id
+        self._keys: List[str] = []
+        self._words: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._grams: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def add_many(self, items: Iterable[Tuple[str, str]]) -> int:
+        """Index (key, word) pairs whose key is new; returns how many were added."""
+        added = 0
+        with self._lock:
+            for key, word in items:
+                if key in self._ids:
+                    continue
+                word_id = self._ids[key] = len(self._keys)
+                self._keys.append(key)
+                self._words.append(word)
+                for gram in trigrams(key):
+                    self._grams.setdefault(gram, []).append(word_id)
+                added += 1
+        return added
+
+    def lookup(self, key: str, k: int = 5, max_distance: Optional[int] = None) -> List[str]:
+        """Return up to k indexed words closest to key, nearest first.
+
+        max_distance defaults to 1 edit, or 2 for keys of 8 or more
+        characters. An exact match, if any, comes first.
+        """
+        if not key:
+            return []
+        if max_distance is None:
+            max_distance = 1 if len(key) < 8 else 2
+        query = trigrams(key)
+        # Fewer shared trigrams than this rules out a match within max_distance
+        need = max(1, len(query) - _GRAMS_PER_EDIT * max_distance)
+        with self._lock:
+            shared: Dict[int, int] = {}
+            for gram in query:
+                for word_id in self._grams.get(gram, ()):
+                    shared[word_id] = shared.get(word_id, 0) + 1
+            # Check the words sharing the most trigrams first; once k are found
+            # the bound tightens and the remaining buckets can be cut short
+            buckets: List[List[int]] = [[] for _ in range(len(query) + 1)]
+            for word_id, count in shared.items():
+                if count >= need:
+                    buckets[count].append(word_id)
+            ranked = []
+            bound = max_distance
+            for count in range(len(query), need - 1, -1):
+                if count < len(query) - _GRAMS_PER_EDIT * bound:
+                    break
+                for word_id in buckets[count]:
+                    distance = edit_distance(key, self._keys[word_id], bound)
+                    if distance <= bound:
+                        ranked.append((distance, -count, self._words[word_id]))
+                if len(ranked) >= k:
+                    ranked.sort()
+                    del ranked[k:]
+                    # Later buckets share fewer trigrams, so they only matter if strictly closer
+                    bound = ranked[-1][0] - 1
+                    if bound < 0:
+                        break
+        ranked.sort()
+        return [word for _, _, word in ranked[:k]]
@@ -0,0 +1,132 @@
+import http.client
+import threading
+import urllib.error
+import urllib.request
+from typing import Dict, List, Mapping, Tuple
+from urllib.parse import urljoin, urlsplit
+
+# Idle keep-alive connections kept per host
+POOL_MAX_IDLE = 4
+MAX_REDIRECTS = 5
+
+_HostKey = Tuple[str, str, int]
+
+
+class ConnectionPool:
+    """Reuse keep-alive HTTP(S) connections across requests and threads.
+
+    A connection is held by one request at a time and returned to its
+    host's idle list afterwards, unless the server asked to close it. A
+    request that fails on a reused connection (the server may have dropped
+    it while idle) is retried once on a fresh one.
+
+    Proxy settings are honoured as urllib honours them (http_proxy,
+    https_proxy and no_proxy, or the system settings on Windows and
+    macOS): a request that has to go through a proxy is sent with urllib
+    instead, without pooling.
+    """
+
+    def __init__(self, timeout: float, max_idle: int = POOL_MAX_IDLE) -> None:
+        self._timeout = timeout
+        self._max_idle = max_idle
+        self._lock = threading.Lock()
+        self._idle: Dict[_HostKey, List[http.client.HTTPConnection]] = {}
+        # Read once; on Windows and macOS they come from the system settings
+        self._proxies = urllib.request.getproxies()
+        # Host -> whether no_proxy (or the system bypass list) exempts it
+        self._bypass: Dict[str, bool] = {}
+
+    def _acquire(self, key: _HostKey) -> Tuple[http.client.HTTPConnection, bool]:
+        """Return (connection, reused)."""
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        scheme, host, port = key
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return cls(host, port, timeout=self._timeout), False
+
+    def _release(self, key: _HostKey, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self._max_idle:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+    def _proxied(self, url: str) -> bool:
+        parts = urlsplit(url)
+        if not self._proxies.get(parts.scheme.lower()):
+            return False
+        host = parts.hostname or ""
+        bypass = self._bypass.get(host)
+        if bypass is None:
+            bypass = self._bypass[host] = bool(urllib.request.proxy_bypass(host))
+        return not bypass
+
+    def _send_via_urllib(self, url: str, headers: Mapping[str, str]) -> Tuple[int, http.client.HTTPMessage, bytes]:
+        """GET url through the configured proxy; urllib follows redirects itself."""
+        request = urllib.request.Request(url, headers=dict(headers))
+        try:
+            with urllib.request.urlopen(request, timeout=self._timeout) as response:
+                return response.status, response.headers, response.read()
+        except urllib.error.HTTPError as exc:
+            # urllib treats every non-2xx status as an error, 304 included
+            if exc.code == 304:
+                return 304, exc.headers, b""
+            raise
+
+    def _send(self, url: str, headers: Mapping[str, str]) -> Tuple[int, http.client.HTTPMessage, bytes]:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https"):
+            raise ValueError(f"unsupported URL scheme: {url}")
+        key = (scheme, parts.hostname or "", parts.port or (443 if scheme == "https" else 80))
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        while True:
+            conn, reused = self._acquire(key)
+            try:
+                conn.request("GET", path, headers=dict(headers))
+                response = conn.getresponse()
+                body = response.read()
+            except (OSError, http.client.HTTPException) as exc:
+                conn.close()
+                if reused:
+                    continue
+                # Like urllib, connection failures surface as URLError (an OSError)
+                if isinstance(exc, OSError):
+                    raise
+                raise urllib.error.URLError(exc) from exc
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(key, conn)
+            return response.status, response.headers, body
+
+    def get(self, url: str, headers: Mapping[str, str]) -> Tuple[int, http.client.HTTPMessage, bytes]:
+        """GET url, following redirects. Returns (status, headers, body).
+
+        Like urllib, error statuses (400 and up) raise urllib.error.HTTPError;
+        304 is returned normally.
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            if self._proxied(url):
+                return self._send_via_urllib(url, headers)
+            status, response_headers, body = self._send(url, headers)
+            location = response_headers.get("Location")
+            if status in (301, 302, 303, 307, 308) and location:
+                url = urljoin(url, location)
+                continue
+            if status >= 400:
+                raise urllib.error.HTTPError(url, status, http.client.responses.get(status, ""), response_headers, None)
+            return status, response_headers, body
+        raise urllib.error.HTTPError(url, status, "too many redirects", response_headers, None)
@@ -0,0 +1,131 @@
+"""Streaming export and import of word entries.
+
+Entries are written and read one record at a time, so the cost of a
+transfer is the entries themselves and never a whole serialized document.
+"""
+import csv
+import html
+import json
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, TextIO
+
+from storage import dict_to_entry, entry_to_dict
+from word_entry import WordEntry
+
+# Formats by file extension; anki is a tab-separated file for Anki's File > Import,
+# and the only one that cannot be read back
+EXPORT_FORMATS = {".jsonl": "jsonl", ".csv": "csv", ".txt": "anki"}
+# Tag given to every exported Anki note
+ANKI_TAG = "verba"
+
+# Record layout of wotd.json, which CSV uses as its header
+_FIELDS = tuple(field.name for field in fields(WordEntry))
+# Every field but published_at holds text
+_TEXT_FIELDS = tuple(field for field in _FIELDS if field != "published_at")
+
+
+def guess_format(path: Optional[str], default: str = "jsonl") -> str:
+    """Format for a file name, by extension; default for stdout and unknown extensions."""
+    if not path:
+        return default
+    return EXPORT_FORMATS.get(Path(path).suffix.lower(), default)
+
+
+def _anki_back(entry: WordEntry) -> str:
+    meta = " ".join(html.escape(part) for part in (entry.part_of_speech, entry.pronunciation) if part)
+    parts = [f"<i>{meta}</i>" if meta else "", html.escape(entry.definition)]
+    if entry.usage_example:
+        parts.append(f"<i>{html.escape(entry.usage_example)}</i>")
+    return "<br>".join(part for part in parts if part)
+
+
+def write_entries(entries: Iterable[WordEntry], out: TextIO, fmt: str) -> int:
+    """Write entries to out in fmt ("jsonl", "csv" or "anki"); returns how many.
+
+    out should be opened with newline="" for csv and anki, like any file
+    handed to the csv module.
+    """
+    count = 0
+    if fmt == "jsonl":
+        for entry in entries:
+            out.write(json.dumps(entry_to_dict(entry), ensure_ascii=False) + "\n")
+            count += 1
+    elif fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=_FIELDS)
+        writer.writeheader()
+        for entry in entries:
+            writer.writerow(entry_to_dict(entry))
+            count += 1
+    elif fmt == "anki":
+        # Headers read by Anki 2.1.55+; older versions ask for the same settings
+        out.write("#separator:tab\n#html:true\n#tags column:3\n")
+        writer = csv.writer(out, delimiter="\t", lineterminator="\n")
+        for entry in entries:
+            tags = " ".join(filter(None, (ANKI_TAG, entry.part_of_speech.replace(" ", "_"))))
+            writer.writerow((html.escape(entry.word), _anki_back(entry), tags))
+            count += 1
+    else:
+        raise ValueError(f"unknown export format: {fmt}")
+    return count
+
+
+def _csv_record(row: Dict[str, Optional[str]]) -> Dict[str, object]:
+    record: Dict[str, object] = {field: row.get(field) or "" for field in _TEXT_FIELDS}
+    try:
+        record["published_at"] = int(row.get("published_at") or 0)
+    except ValueError:
+        # Parsed again from published
+        record["published_at"] = 0
+    return record
+
+
+def _checked_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the WordEntry fields of record, raising ValueError for a field of the wrong type.
+
+    Text fields must be strings; missing ones are left empty. A
+    published_at that is not an integer is parsed again from published.
+    """
+    checked: Dict[str, Any] = {}
+    for field in _TEXT_FIELDS:
+        value = record.get(field, "")
+        if not isinstance(value, str):
+            raise ValueError(f"{field} must be a string, not {type(value).__name__}")
+        checked[field] = value
+    published_at = record.get("published_at")
+    # bool is a subclass of int, and never a timestamp
+    checked["published_at"] = published_at if type(published_at) is int else 0
+    return checked
+
+
+def read_entries(infile: TextIO, fmt: str) -> Iterator[WordEntry]:
+    """Yield the entries of a jsonl or csv file lazily.
+
+    Missing fields are left empty. A malformed record, or one with a field
+    of the wrong type, raises ValueError naming its line, before anything
+    after it is read.
+    """
+    if fmt == "jsonl":
+        for lineno, line in enumerate(infile, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError("not a JSON object")
+                entry = dict_to_entry(_checked_record(record))
+            except (ValueError, TypeError) as exc:
+                raise ValueError(f"line {lineno}: {exc}") from None
+            yield entry
+    elif fmt == "csv":
+        reader = csv.DictReader(infile)
+        if "word" not in (reader.fieldnames or ()):
+            raise ValueError("CSV header has no word column")
+        for row in reader:
+            try:
+                entry = dict_to_entry(_checked_record(_csv_record(row)))
+            except (ValueError, TypeError) as exc:
+                raise ValueError(f"line {reader.line_num}: {exc}") from None
+            yield entry
+    else:
+        raise ValueError(f"cannot import format: {fmt}")
@@ -0,0 +1,195 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional
+
+import perf
+from paths import DATA_DIR, DATA_FILE
+from storage import JsonRepository, entry_to_dict, file_signature, save_data
+from word_entry import WordEntry
+
+JOURNAL_FILE = DATA_DIR / "wotd.journal"
+# Fold the journal into wotd.json once it grows past this many bytes
+JOURNAL_COMPACT_BYTES = 256 * 1024
+
+
+class JournalRepository(JsonRepository):
+    """Log-structured variant of the JSON repository.
+
+    wotd.json is a compacted snapshot; every mutation appends one JSON line
+    to wotd.journal, so a write costs O(1) instead of a full rewrite. State
+    is the snapshot plus the journal records newer than its journal_seq.
+    A torn trailing record left by a crash is dropped on replay, and a
+    corrupt record elsewhere is skipped without losing the ones after it.
+    Once the journal outgrows JOURNAL_COMPACT_BYTES it is folded into the
+    snapshot on a background thread.
+
+    Appends and compactions hold the wotd.lock file lock. Before appending,
+    records other processes added since this one last read are replayed,
+    and a snapshot they replaced is reloaded, so every process's state is
+    the log up to its own latest record.
+    """
+
+    def __init__(self, journal_path: Path = JOURNAL_FILE) -> None:
+        super().__init__()
+        self._journal_path = journal_path
+        self._journal: Optional[BinaryIO] = None
+        self._journal_size = 0
+        self._seq = 0
+        self._compactor: Optional[threading.Thread] = None
+
+    def _load(self) -> None:
+        with self._file_lock:
+            self._reload()
+
+    def _reload(self) -> None:
+        """Load the snapshot and replay the journal; the caller holds the file lock."""
+        super()._load()
+        self._seq = self._meta.get("journal_seq", 0)
+        self._journal_size = 0
+        self._journal_path.parent.mkdir(parents=True, exist_ok=True)
+        if self._journal is None:
+            self._journal = self._journal_path.open("ab")
+        self._replay()
+
+    def _replay(self) -> bool:
+        """Apply the records past the part of the journal already read; True if there were any.
+
+        The caller holds the file lock, so an incomplete last record is one a
+        crashed writer left, and is cut off so new records follow the last good one.
+        """
+        end = os.fstat(self._journal.fileno()).st_size
+        if end == self._journal_size:
+            return False
+        applied = False
+        with self._journal_path.open("rb") as f:
+            f.seek(self._journal_size)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                self._journal_size += len(line)
+                op = _parse_record(line)
+                if op is None:
+                    perf.count("journal.corrupt_records")
+                    continue
+                # Records already folded into the snapshot
+                if op["seq"] <= self._seq:
+                    continue
+                self._apply(op)
+                self._seq = op["seq"]
+                applied = True
+        if end > self._journal_size:
+            self._journal.truncate(self._journal_size)
+        return applied
+
+    def _catch_up(self) -> bool:
+        """Bring the state up to date with other processes' writes; True if it changed.
+
+        The caller holds the file lock.
+        """
+        if file_signature(DATA_FILE) != self._file_state:
+            # Another process compacted the journal into a new snapshot
+            self._reload()
+            return True
+        return self._replay()
+
+    @perf.timed("journal.append", log=False)
+    def _changed(self, key: str, op: Dict[str, Any]) -> None:
+        self._entries.pop(key, None)
+        if "entries" in op:
+            op = {"op": op["op"], "records": [entry_to_dict(e) for e in op["entries"]]}
+        with self._file_lock:
+            if self._catch_up():
+                perf.count("journal.catch_ups")
+                # Our mutation goes after theirs in the log; apply it in that order too
+                self._apply(op)
+            self._append(op)
+
+    def _append(self, op: Dict[str, Any]) -> None:
+        """Write op as the next journal record; the caller holds the file lock."""
+        self._seq += 1
+        line = json.dumps({"seq": self._seq, **op}, ensure_ascii=False).encode("utf-8") + b"\n"
+        self._journal.write(line)
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self._journal_size += len(line)
+        if self._journal_size >= JOURNAL_COMPACT_BYTES and not (self._compactor and self._compactor.is_alive()):
+            # Callers may be on the Tk thread; compaction rewrites the whole snapshot
+            self._compactor = threading.Thread(target=self._compact_at_least, args=(JOURNAL_COMPACT_BYTES,), name="verba-compact", daemon=True)
+            self._compactor.start()
+
+    def toggle_favorite(self, entry: WordEntry) -> bool:
+        # Decided under the file lock on the caught-up state, so that when
+        # several processes toggle one word each toggle flips it once
+        with self._lock:
+            self._index("favorites")
+            with self._file_lock:
+                if self._catch_up():
+                    perf.count("journal.catch_ups")
+                is_fav = self._toggle(entry)
+                self._entries.pop("favorites", None)
+                if is_fav:
+                    self._append({"op": "favorite_add", "record": entry_to_dict(entry)})
+                else:
+                    self._append({"op": "favorite_remove", "word": entry.word})
+                return is_fav
+
+    def compact(self) -> None:
+        """Write a fresh snapshot and empty the journal.
+
+        The snapshot is replaced atomically before the journal is truncated;
+        if a crash falls in between, replay skips the records it already
+        contains.
+        """
+        self._compact_at_least(0)
+
+    def _compact_at_least(self, min_bytes: int) -> None:
+        """Compact if the journal, once caught up, still holds min_bytes or more.
+
+        Another process may have compacted it since a background compaction was started.
+        """
+        with self._lock:
+            if self._lists is None or self._journal is None:
+                return
+            self._file_lock.acquire()
+            try:
+                self._catch_up()
+                if self._journal_size < min_bytes:
+                    self._file_lock.release()
+                    return
+                self._meta["journal_seq"] = self._seq
+                snapshot = self._snapshot()
+            except BaseException:
+                self._file_lock.release()
+                raise
+        # Readers need not wait for the write. Appends wait on the file lock,
+        # so the journal holds nothing newer than the snapshot when it is cut.
+        try:
+            self._compact(snapshot)
+        finally:
+            self._file_lock.release()
+
+    @perf.timed("journal.compact")
+    def _compact(self, snapshot: Dict[str, Any]) -> None:
+        save_data(self._records(snapshot))
+        self._file_state = file_signature(DATA_FILE)
+        self._journal.truncate(0)
+        self._journal_size = 0
+
+    def flush(self) -> None:
+        # Records are fsynced as they are appended; only a running compaction is waited for
+        compactor = self._compactor
+        if compactor is not None and compactor is not threading.current_thread():
+            compactor.join()
+
+
+def _parse_record(line: bytes) -> Optional[Dict[str, Any]]:
+    """Return the journal record on line, or None if it is not one."""
+    try:
+        op = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(op, dict) or type(op.get("seq")) is not int:
+        return None
+    return op
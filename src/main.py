@@ -1,10 +1,36 @@
+from __future__ import annotations
+
+import time
+
+# Taken before the remaining imports so startup metrics include them
+_PROCESS_START = time.perf_counter()
+
+import json
 import sys
+from datetime import datetime
 from pathlib import Path
 import tkinter as tk
 from tkinter import ttk
+from typing import TYPE_CHECKING, Callable
 
-from rss_client import fetch_latest_word, WordEntry
-from storage import add_history, toggle_favorite
+import perf
+from fetch_worker import FetchWorker
+from paths import DATA_DIR
+from startup_profile import StartupProfile
+from storage import (
+    ChangeEvent,
+    FavoriteAdded,
+    HistoryInserted,
+    add_history,
+    add_history_many,
+    flush,
+    get_history,
+    is_favorite,
+    subscribe,
+    toggle_favorite,
+    warm_indexes,
+    word_key,
+)
 from tabs import (
     build_home_tab,
     build_history_tab,
@@ -14,23 +40,51 @@ from tabs import (
     load_history,
     load_favorites,
     load_flashcards,
+    on_history_inserted,
+    on_favorite_added,
+    on_favorite_removed,
 )
+from word_entry import published_date
 
 from config import BACKGROUND
 
 from config import setup_styles
 
+if TYPE_CHECKING:
+    from word_entry import WordEntry
+
+_IMPORTS_DONE = time.perf_counter()
+
+# How often the UI checks for a finished background fetch
+FETCH_POLL_MS = 50
+# One JSON line per launch with the time to first useful paint
+STARTUP_METRICS_FILE = DATA_DIR / "startup_metrics.jsonl"
+# Default report location for --startup-profile
+STARTUP_PROFILE_FILE = DATA_DIR / "startup_profile.json"
+
+
+def _fetch_feed() -> list[WordEntry]:
+    # Imported on the worker thread, off the startup path
+    from feeds import fetch_feeds
+    return fetch_feeds()
+
+
 class App(tk.Tk):
-    def __init__(self) -> None:
-        super().__init__()
+    def __init__(self, profile: StartupProfile | None = None) -> None:
+        self.profile = profile or StartupProfile(_PROCESS_START)
+        self.profile.add_phase("imports", _PROCESS_START, _IMPORTS_DONE)
+        with self.profile.phase("tk_init"):
+            super().__init__()
         self.title("Verba")
         self.geometry("450x580")
         self.resizable(False, False)
         self.configure(bg=BACKGROUND)
         
-        self._set_window_icon()
-        self._set_dark_title_bar()
-        setup_styles(self)
+        with self.profile.phase("window_icon"):
+            self._set_window_icon()
+            self._set_dark_title_bar()
+        with self.profile.phase("setup_styles"):
+            setup_styles(self)
         
         # Home StringVars
         self.word_var = tk.StringVar(value="Loading...")
@@ -43,6 +97,10 @@ class App(tk.Tk):
         self.dyk_var = tk.StringVar(value="")
         self.favorite_var = tk.StringVar(value="☆")
         self.favorites_detail_var = tk.StringVar(value="Select a word to see details.")
+        self.search_var = tk.StringVar(value="")
+        self.suggestion_var = tk.StringVar(value="")
+        # Why the last refresh failed; empty once one succeeds
+        self.fetch_status_var = tk.StringVar(value="")
         
 
         # Favorites StringVars
@@ -70,17 +128,39 @@ class App(tk.Tk):
         self.notebook.add(self.favorites_tab, text="Favorites")
         self.notebook.add(self.flashcards_tab, text="Flashcards")
         
-        build_home_tab(self)
-        build_favorites_tab(self)
-        build_flashcards_tab(self)
+        # name -> (frame, builder, loader). Only Home is built up front; the
+        # others are built and loaded the first time they are shown.
+        self._tabs = {
+            "home": (self.home_tab, build_home_tab, load_home),
+            "favorites": (self.favorites_tab, build_favorites_tab, load_favorites),
+            "flashcards": (self.flashcards_tab, build_flashcards_tab, load_flashcards),
+        }
+        self._built_tabs: set[str] = set()
+        # Built tabs whose contents changed while they were hidden
+        self._stale_tabs: set[str] = set()
+        self._build_tab("home")
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
 
         
         self.current_entry: WordEntry | None = None
         self.history_data: list[WordEntry] = []
         self.favorites_data: list[WordEntry] = []
-        self.flashcards: list[WordEntry] = []
-        self.flashcard_index = 0
+        # Review deck by word key, and the card on screen
+        self.flashcard_entries: dict[str, WordEntry] = {}
+        self.flashcard_key: str | None = None
         self.flashcard_flipped = False
+        self.latest_word: str | None = None
+
+        with self.profile.phase("first_paint"):
+            self._paint_last_known()
+        # From here on, tabs follow storage changes through events
+        self._unsubscribe = subscribe(self._on_storage_event)
+        # Searching needs the indexes; get them ready off the Tk thread
+        warm_indexes()
+
+        self.fetch_worker = FetchWorker(_fetch_feed)
+        self._fetch_poll_id: str | None = None
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
 
         self.after(100, self.refresh)  
         
@@ -114,38 +194,186 @@ class App(tk.Tk):
             pass
             
     def refresh(self) -> None:
-        entry = fetch_latest_word()
+        """Fetch the latest word in the background.
+
+        Calls made while a fetch is already running are merged into it.
+        """
+        self.fetch_worker.request()
+        if self._fetch_poll_id is None:
+            self._fetch_poll_id = self.after(FETCH_POLL_MS, self._poll_fetch)
+
+    def _poll_fetch(self) -> None:
+        """Drain finished fetches from the worker without blocking the event loop."""
+        self._fetch_poll_id = None
+        # Read before draining: a fetch that finishes in between leaves its
+        # result queued, and only a later poll can pick it up
+        busy = self.fetch_worker.busy
+        for entries, error in self.fetch_worker.poll():
+            if "first_refresh" not in self.profile.marks:
+                with self.profile.phase("first_refresh_apply"):
+                    self._apply_fetch(entries, error)
+                self.profile.mark("first_refresh")
+                self.profile.write()
+            else:
+                self._apply_fetch(entries, error)
+        if busy:
+            self._fetch_poll_id = self.after(FETCH_POLL_MS, self._poll_fetch)
+
+    def _apply_fetch(self, entries: list[WordEntry] | None, error: BaseException | None) -> None:
+        if error is not None:
+            self.fetch_status_var.set(f"Refresh failed: {error}")
+            if self.latest_word is None:
+                self.word_var.set("(no data)")
+            return
+        self.fetch_status_var.set("")
+        self._apply_feed(entries)
+
+    def cancel_refresh(self) -> None:
+        """Stop waiting on the fetch in flight and drop its result."""
+        self.fetch_worker.cancel()
+        if self._fetch_poll_id is not None:
+            self.after_cancel(self._fetch_poll_id)
+            self._fetch_poll_id = None
+
+    def on_close(self) -> None:
+        self.cancel_refresh()
+        self._unsubscribe()
+        flush()
+        # Closed before the first refresh finished: report what was measured
+        self.profile.write()
+        self.destroy()
+
+    def _build_tab(self, name: str) -> None:
+        _, builder, _ = self._tabs[name]
+        with self.profile.phase(f"build_{name}_tab"):
+            builder(self)
+        self._built_tabs.add(name)
+        self._stale_tabs.add(name)
+
+    def _visible_tab(self) -> str | None:
+        selected = self.notebook.select()
+        for name, (frame, _, _) in self._tabs.items():
+            if str(frame) == selected:
+                return name
+        return None
+
+    def _on_tab_changed(self, event: tk.Event) -> None:
+        name = self._visible_tab()
+        if name is None:
+            return
+        if name not in self._built_tabs:
+            self._build_tab(name)
+        if name in self._stale_tabs:
+            self._stale_tabs.discard(name)
+            self._tabs[name][2](self)
+
+    def reload_tabs(self, *names: str) -> None:
+        """Reload the visible tab among names now; mark the rest stale.
+
+        Tabs that were never built are skipped, they load when first shown.
+        """
+        visible = self._visible_tab()
+        for name in names:
+            if name not in self._built_tabs:
+                continue
+            if name == visible:
+                self._stale_tabs.discard(name)
+                self._tabs[name][2](self)
+            else:
+                self._stale_tabs.add(name)
+
+    def _on_storage_event(self, event: ChangeEvent) -> None:
+        """Apply a storage change to the tabs as a minimal listbox diff."""
+        if isinstance(event, HistoryInserted):
+            self._patch_tab("home", on_history_inserted, event)
+            self.reload_tabs("flashcards")
+            return
+        if isinstance(event, FavoriteAdded):
+            self._patch_tab("favorites", on_favorite_added, event)
+        else:
+            self._patch_tab("favorites", on_favorite_removed, event)
+        if self.current_entry and word_key(self.current_entry.word) == word_key(event.entry.word):
+            self.favorite_var.set("★" if isinstance(event, FavoriteAdded) else "☆")
+
+    def _patch_tab(self, name: str, patch: Callable[[App, ChangeEvent], bool], event: ChangeEvent) -> None:
+        # Unbuilt and stale tabs load everything when shown anyway
+        if name not in self._built_tabs or name in self._stale_tabs:
+            return
+        if not patch(self, event):
+            self.reload_tabs(name)
+
+    def _paint_last_known(self) -> None:
+        """Show the newest stored word before any network access.
+
+        Falls back to the cached feed entry when history is empty, then
+        records the time to first useful paint.
+        """
+        history = get_history()
+        if history:
+            entry, source = history[0], "history"
+        else:
+            from rss_client import load_cached_word
+            entry, source = load_cached_word(), "feed_cache"
+            if entry is not None:
+                add_history(entry)
+        if entry is not None:
+            self.latest_word = entry.word
+            self._show_entry(entry)
+            self.reload_tabs("home", "favorites", "flashcards")
+        else:
+            source = "none"
+        self.update_idletasks()
+        self.first_paint_ms = self.profile.mark("first_paint")
+        self._record_startup_metric(source)
+
+    def _record_startup_metric(self, source: str) -> None:
+        record = {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "first_paint_ms": round(self.first_paint_ms, 1),
+            "source": source,
+        }
+        try:
+            DATA_DIR.mkdir(parents=True, exist_ok=True)
+            with STARTUP_METRICS_FILE.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError:
+            pass
+
+    def _apply_feed(self, entries: list[WordEntry]) -> None:
+        """Revalidate the painted word against a fetch result.
+
+        Every feed item is ingested in one batch; the word details are only
+        repainted when the feed's newest word differs from the one shown.
+        """
+        # New words reach the tabs through the HistoryInserted event
+        add_history_many(entries)
+        latest_changed = bool(entries) and entries[0].word != self.latest_word
+        if latest_changed:
+            self.latest_word = entries[0].word
+            self._show_entry(entries[0])
+        if not entries and self.latest_word is None:
+            self.word_var.set("(no data)")
+
+    def _show_entry(self, entry: WordEntry) -> None:
         self.current_entry = entry
         
         # Update UI vars to show latest word
         self.word_var.set(entry.word)
         self.meta_var.set(f"{entry.pronunciation}  •  {entry.part_of_speech}" if entry.pronunciation else entry.part_of_speech)
-        # Extract date from published (e.g., "Mon, 20 Jan 2025 00:00:00 -0500" -> "20 Jan 2025")
-        date_only = entry.published
-        if entry.published:
-            parts = entry.published.split()
-            if len(parts) >= 4:
-                date_only = f"{parts[1]} {parts[2]} {parts[3]}"
+        date_only = published_date(entry)
         self.published_var.set(f"Published: {date_only}" if date_only else "")
         self.short_def_var.set(entry.short_definition)
         self.definition_var.set(entry.definition)
         self.usage_var.set(entry.usage_example)
         self.examples_var.set(entry.examples)
         self.dyk_var.set(entry.did_you_know)
-        self.favorite_var.set("☆")
-        
-        add_history(entry)       
-        load_home(self)
-        load_favorites(self)
-        load_flashcards(self)
+        self.favorite_var.set("★" if is_favorite(entry.word) else "☆")
 
     def toggle_home_favorite(self) -> None:
         """Toggle favorite status for the current word entry."""
         if not self.current_entry:
             return
-        is_fav = toggle_favorite(self.current_entry)
-        self.favorite_var.set("★" if is_fav else "☆")
-        load_favorites(self)
+        toggle_favorite(self.current_entry)
 
     def toggle_history_favorite(self) -> None:
         """Toggle favorite status for the currently selected history entry."""
@@ -155,8 +383,30 @@ class App(tk.Tk):
         entry = self.history_data[index]
         is_fav = toggle_favorite(entry)
         self.hist_favorite_var.set("★" if is_fav else "☆")
-        load_favorites(self)
+
+def _parse_args(argv: list[str]) -> tuple[StartupProfile, Path | None]:
+    """Return the startup profile and, with --profile, where to write cProfile stats."""
+    profile = StartupProfile(_PROCESS_START)
+    if not argv:
+        return profile, None
+    import argparse
+    parser = argparse.ArgumentParser(prog="verba")
+    parser.add_argument(
+        "--startup-profile", nargs="?", const=str(STARTUP_PROFILE_FILE), metavar="PATH",
+        help=f"write startup phase timings as JSON (default: {STARTUP_PROFILE_FILE})",
+    )
+    parser.add_argument(
+        "--profile", nargs="?", const=str(perf.PROFILE_FILE), metavar="PATH",
+        help=f"run the session under cProfile and write its stats on exit (default: {perf.PROFILE_FILE})",
+    )
+    args = parser.parse_args(argv)
+    if args.startup_profile:
+        profile.report_path = Path(args.startup_profile)
+    return profile, Path(args.profile) if args.profile else None
+
 
 if __name__ == "__main__":
-    app = App()
-    app.mainloop()
\ No newline at end of file
+    startup_profile, stats_path = _parse_args(sys.argv[1:])
+    with perf.profiled(stats_path):
+        app = App(startup_profile)
+        app.mainloop()
\ No newline at end of file
@@ -0,0 +1,12 @@
+import os
+import sys
+from pathlib import Path
+
+if getattr(sys, "frozen", False):
+    BASE_DIR = Path(sys.executable).parent
+else:
+    BASE_DIR = Path(__file__).resolve().parent.parent
+
+# VERBA_DATA_DIR points a run at another data directory, e.g. for benchmarks
+DATA_DIR = Path(os.environ["VERBA_DATA_DIR"]) if os.environ.get("VERBA_DATA_DIR") else BASE_DIR / "data"
+DATA_FILE = DATA_DIR / "wotd.json"
@@ -0,0 +1,274 @@
+"""Opt-in performance instrumentation: spans, counters and histograms.
+
+Enabled by setting VERBA_PERF=1 before start. When it is off, timed()
+returns the function it decorates unchanged, and span(), count() and
+observe() return at once, so instrumented code pays one call and a flag
+test at most.
+
+When it is on, each span is appended to data/perf.jsonl as one JSON line
+as it ends, and its duration also goes into the histogram of the same
+name. Counters and histograms are summarized in one more line at exit.
+The log rotates at PERF_LOG_BYTES and keeps PERF_LOG_BACKUPS old files;
+every process that has instrumentation on (the GUI, verba commands, the
+daemon) appends to the same log.
+"""
+import atexit
+import functools
+import json
+import math
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, Iterator, Optional, TypeVar
+
+from paths import DATA_DIR
+
+# "1" (or "true", "yes", "on") turns instrumentation on for the process
+ENABLED = os.environ.get("VERBA_PERF", "").lower() in ("1", "true", "yes", "on")
+PERF_LOG_FILE = DATA_DIR / "perf.jsonl"
+# Size at which perf.jsonl is rotated to perf.jsonl.1, and how many old logs are kept
+PERF_LOG_BYTES = 1024 * 1024
+PERF_LOG_BACKUPS = 3
+# Default cProfile output of --profile; open it with pstats or snakeviz
+PROFILE_FILE = DATA_DIR / "verba.prof"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_NULL_SPAN = nullcontext()
+_START = time.time()
+_lock = threading.Lock()
+_counters: Dict[str, int] = {}
+_histograms: Dict[str, "Histogram"] = {}
+_log: Optional["_SharedLog"] = None
+
+
+class Histogram:
+    """Count, sum, min and max of a series, with power-of-two buckets for percentiles.
+
+    Memory is a few dozen buckets however many values are added; a
+    percentile is the upper bound of its bucket, so it is at most 2x high.
+    """
+
+    __slots__ = ("count", "total", "min", "max", "_buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        # Exponent e -> values in [2**(e-1), 2**e)
+        self._buckets: Dict[int, int] = {}
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        exponent = math.frexp(value)[1]
+        self._buckets[exponent] = self._buckets.get(exponent, 0) + 1
+
+    def percentile(self, q: float) -> float:
+        """Return an upper bound on the q-th percentile (0-100)."""
+        rank = q / 100 * self.count
+        seen = 0
+        for exponent in sorted(self._buckets):
+            seen += self._buckets[exponent]
+            if seen >= rank:
+                return min(math.ldexp(1.0, exponent), self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 3),
+            "min": round(self.min, 3),
+            "max": round(self.max, 3),
+            "p50": round(self.percentile(50), 3),
+            "p90": round(self.percentile(90), 3),
+            "p99": round(self.percentile(99), 3),
+        }
+
+
+class _SharedLog:
+    """A size-rotated log file that several processes append to at once.
+
+    Each line is appended with a single O_APPEND write, so lines from
+    different processes do not interleave. Rotation renames files that
+    other processes have open, so it runs under a FileLock on the log's
+    .lock file and checks the size again there, in case another process
+    rotated first. A process whose file was rotated away notices by its
+    inode and reopens the path before the next write.
+    """
+
+    def __init__(self, path: Path, max_bytes: int, backups: int) -> None:
+        # file_lock reports its waits through this module; import it once perf is in use
+        from file_lock import FileLock
+        self._path = path
+        self._max_bytes = max_bytes
+        self._backups = backups
+        self._rotate_lock = FileLock(path.with_suffix(".lock"))
+        self._fd: Optional[int] = None
+        self._inode = 0
+
+    def _open(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(self._path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._inode = os.fstat(self._fd).st_ino
+
+    def write(self, data: bytes) -> bool:
+        """Append data; return True if the file has reached the rotation size."""
+        try:
+            current = os.stat(self._path).st_ino
+        except FileNotFoundError:
+            current = None
+        if self._fd is None or current != self._inode:
+            self._open()
+        os.write(self._fd, data)
+        return self._backups > 0 and os.fstat(self._fd).st_size >= self._max_bytes
+
+    def rotate(self) -> None:
+        """Shift path to path.1, path.1 to path.2 and so on, dropping the oldest."""
+        with self._rotate_lock:
+            try:
+                if os.stat(self._path).st_size < self._max_bytes:
+                    return
+                name = self._path.name
+                for n in range(self._backups - 1, 0, -1):
+                    older = self._path.with_name(f"{name}.{n}")
+                    if older.exists():
+                        os.replace(older, self._path.with_name(f"{name}.{n + 1}"))
+                os.replace(self._path, self._path.with_name(f"{name}.1"))
+            except OSError:
+                # Gone already, or (on Windows) open in another process,
+                # which cannot be renamed; the next write tries again
+                pass
+
+
+def _write(record: Dict[str, Any]) -> None:
+    global _log
+    line = json.dumps(
+        {"ts": round(time.time(), 3), "pid": os.getpid(), "thread": threading.current_thread().name, **record},
+        ensure_ascii=False,
+    ) + "\n"
+    with _lock:
+        if _log is None:
+            _log = _SharedLog(PERF_LOG_FILE, PERF_LOG_BYTES, PERF_LOG_BACKUPS)
+        full = _log.write(line.encode("utf-8"))
+    if full:
+        # Outside _lock, which FileLock takes to record its wait
+        _log.rotate()
+
+
+def count(name: str, n: int = 1) -> None:
+    """Add n to the named counter."""
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def observe(name: str, value: float) -> None:
+    """Add a value (a duration in ms, a size, a count) to the named histogram."""
+    if not ENABLED:
+        return
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram()
+        histogram.add(value)
+
+
+@contextmanager
+def _span(name: str, fields: Dict[str, Any]) -> Iterator[None]:
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as exc:
+        error = type(exc).__name__
+        raise
+    finally:
+        ms = (time.perf_counter() - start) * 1000
+        observe(name, ms)
+        record = {"type": "span", "name": name, "ms": round(ms, 3), **fields}
+        if error:
+            record["error"] = error
+        _write(record)
+
+
+def span(name: str, **fields: Any) -> ContextManager[None]:
+    """Time a block; logged with fields and the exception type if it raised."""
+    if not ENABLED:
+        return _NULL_SPAN
+    return _span(name, fields)
+
+
+def timed(name: str, log: bool = True) -> Callable[[F], F]:
+    """Decorator form of span() for a whole function.
+
+    With log=False, calls only go into the histogram, for functions called
+    too often to log each time. Off, the function is returned as is.
+    """
+    def decorate(func: F) -> F:
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if log:
+                with _span(name, {}):
+                    return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(name, (time.perf_counter() - start) * 1000)
+        return wrapper  # type: ignore[return-value]
+    return decorate
+
+
+def write_summary() -> None:
+    """Log the counters and histograms collected so far, if there are any."""
+    with _lock:
+        if not _counters and not _histograms:
+            return
+        record = {
+            "type": "summary",
+            "uptime_s": round(time.time() - _START, 3),
+            "counters": dict(_counters),
+            "histograms": {name: histogram.to_dict() for name, histogram in _histograms.items()},
+        }
+    _write(record)
+
+
+@contextmanager
+def profiled(path: Optional[Path], top: int = 25) -> Iterator[None]:
+    """Run the block under cProfile if path is given.
+
+    On exit the stats are dumped to path and the top functions by
+    cumulative time are printed to stderr.
+    """
+    if path is None:
+        yield
+        return
+    import cProfile
+    import pstats
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(path))
+        print(f"cProfile stats written to {path}", file=sys.stderr)
+        pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(top)
+
+
+if ENABLED:
+    atexit.register(write_summary)
@@ -0,0 +1,195 @@
+import atexit
+import heapq
+import json
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from paths import DATA_DIR
+from storage import FLUSH_DELAY, write_text
+
+REVIEWS_FILE = DATA_DIR / "reviews.json"
+REVIEWS_VERSION = 1
+
+# SM-2 grades offered by the flashcards tab
+GRADE_AGAIN = 1
+GRADE_HARD = 3
+GRADE_GOOD = 4
+GRADE_EASY = 5
+
+DAY = 86400.0
+# A failed card comes back within the same session after this many seconds
+RELEARN_DELAY = 600.0
+MIN_EASE = 1.3
+
+
+@dataclass
+class CardState:
+    """Review state of one card; due is a Unix timestamp."""
+    ease: float = 2.5
+    interval: int = 0
+    repetitions: int = 0
+    due: float = 0.0
+
+
+def sm2(state: CardState, grade: int, now: float) -> CardState:
+    """Return the state after a review graded 0 (blackout) to 5 (perfect).
+
+    Grades below 3 restart the card's repetitions and bring it back after
+    RELEARN_DELAY; otherwise the interval goes 1 day, 6 days, then grows by
+    the ease factor. The ease factor is adjusted on every review.
+    """
+    ease = max(MIN_EASE, state.ease + 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02))
+    if grade < 3:
+        return CardState(ease, 0, 0, now + RELEARN_DELAY)
+    repetitions = state.repetitions + 1
+    if repetitions == 1:
+        interval = 1
+    elif repetitions == 2:
+        interval = 6
+    else:
+        interval = max(1, round(state.interval * state.ease))
+    return CardState(ease, interval, repetitions, now + interval * DAY)
+
+
+class ReviewScheduler:
+    """SM-2 scheduler over cards keyed by normalized word.
+
+    Cards sit in a heap ordered by due time, so picking the next card and
+    rescheduling a graded one are O(log n). Regrading pushes a new heap
+    item and leaves the old one behind; stale items are skipped when they
+    reach the top. Card states are saved to reviews.json shortly after a
+    grade, and at exit.
+    """
+
+    def __init__(self, path: Path = REVIEWS_FILE) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+        self._states: Dict[str, CardState] = {}
+        # Cards added from history but never graded; not saved
+        self._new: Set[str] = set()
+        # Saved cards whose word is not in the deck
+        self._retired: Dict[str, CardState] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = 0
+        self._timer: Optional[threading.Timer] = None
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self._path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") != REVIEWS_VERSION:
+            return
+        # Loaded cards join the deck when sync() finds their word in it
+        for key, (ease, interval, repetitions, due) in data["cards"].items():
+            self._retired[key] = CardState(ease, interval, repetitions, due)
+
+    def _push(self, key: str, due: float) -> None:
+        heapq.heappush(self._heap, (due, self._seq, key))
+        self._seq += 1
+
+    def sync(self, keys: Iterable[str], now: Optional[float] = None) -> None:
+        """Make the deck exactly keys, in O(len(keys)).
+
+        Unknown keys become new cards, due now in the order given; new cards
+        are not saved until first graded. Cards whose key is missing leave
+        the deck but keep their saved state.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            keys = list(keys)
+            wanted = set(keys)
+            for key in [k for k in self._states if k not in wanted]:
+                self._retired[key] = self._states.pop(key)
+            for key in keys:
+                if key in self._states:
+                    continue
+                state = self._retired.pop(key, None)
+                if state is None:
+                    state = CardState(due=now)
+                    self._new.add(key)
+                self._states[key] = state
+                self._heap.append((state.due, self._seq, key))
+                self._seq += 1
+            # O(n), and cheaper than pushing a large batch one by one
+            heapq.heapify(self._heap)
+
+    def next_card(self, now: Optional[float] = None) -> Tuple[Optional[str], Optional[float]]:
+        """Return (key, due) of the card due soonest, or (None, None) for an empty deck.
+
+        The card may not be due yet; compare due with the current time.
+        """
+        with self._lock:
+            while self._heap:
+                due, _, key = self._heap[0]
+                state = self._states.get(key)
+                if state is not None and state.due == due:
+                    return key, due
+                heapq.heappop(self._heap)
+            return None, None
+
+    def state(self, key: str) -> Optional[CardState]:
+        with self._lock:
+            return self._states.get(key)
+
+    def grade(self, key: str, grade: int, now: Optional[float] = None) -> CardState:
+        """Record a review of key and reschedule it; returns the new state."""
+        now = time.time() if now is None else now
+        with self._lock:
+            state = self._states[key] = sm2(self._states.get(key, CardState()), grade, now)
+            self._new.discard(key)
+            self._push(key, state.due)
+            self._schedule_save()
+        return state
+
+    def due_count(self, now: Optional[float] = None) -> int:
+        """Number of cards due at now; O(n), meant for status text."""
+        now = time.time() if now is None else now
+        with self._lock:
+            return sum(1 for state in self._states.values() if state.due <= now)
+
+    def _schedule_save(self) -> None:
+        # One pending save covers every grade until it runs
+        if self._timer is not None:
+            return
+        self._timer = threading.Timer(FLUSH_DELAY, self.save)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _snapshot(self) -> Dict[str, Any]:
+        cards = {
+            key: [round(s.ease, 3), s.interval, s.repetitions, s.due]
+            for states in (self._retired, self._states)
+            for key, s in states.items()
+            if key not in self._new
+        }
+        return {"version": REVIEWS_VERSION, "cards": cards}
+
+    def save(self) -> None:
+        """Write graded card states now."""
+        with self._lock:
+            if self._timer is None:
+                return
+            self._timer.cancel()
+            self._timer = None
+            text = json.dumps(self._snapshot(), ensure_ascii=False, separators=(",", ":"))
+        write_text(text, self._path)
+
+
+_scheduler: Optional[ReviewScheduler] = None
+
+
+def get_scheduler() -> ReviewScheduler:
+    """Return the process-wide scheduler, loading reviews.json on first use."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = ReviewScheduler()
+        atexit.register(_scheduler.save)
+    return _scheduler
@@ -1,107 +1,145 @@
 import html
+import io
+import itertools
+import json
 import re
-from dataclasses import dataclass
-import feedparser
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import perf
+from paths import DATA_DIR
+from word_entry import WordEntry
 
 FEED_URL = "https://www.merriam-webster.com/wotd/feed/rss2"
+# Validators and the parsed entries of the last 200 response
+FEED_CACHE_FILE = DATA_DIR / "feed_cache.json"
+# Raw body of the last 200 response
+FEED_BODY_FILE = DATA_DIR / "feed_cache.xml"
+FETCH_TIMEOUT = 10
+USER_AGENT = "Verba (+https://github.com/KFuria/Verba)"
 
 
-@dataclass(frozen=True)
-class WordEntry:
-    word: str
-    pronunciation: str
-    part_of_speech: str
-    definition: str
-    short_definition: str
-    usage_example: str
-    examples: str
-    did_you_know: str
-    published: str
-    link: str
-    
-def _strip_html(text:str) -> str:
-    # remove anchor tags
-    text = re.sub(r"<a[^>]*>([^<]*)</a>", r"\1", text)
-    # HTML tags
-    plain = re.sub(r"<[^>]+>", "", text)
-    # URLs
-    plain = re.sub(r"https?://\S+","", plain)
-    
-    return html.unescape(plain).strip()
+_TAG_RE = re.compile(r"<[^>]+>")
+_URL_RE = re.compile(r"https?://\S+")
+_PRONUNCIATION_RE = re.compile(r"\\([^\\]+)\\")
+_PART_OF_SPEECH_RE = re.compile(r"\\[^\\]+\\[^<]*<em>([^<]+)</em>")
+# Section boundaries, collected in a single scan of the description. The
+# shared "<" is factored out so the scanner only tries the branches at tags.
+_MARKER_RE = re.compile(
+    r"<(?:"
+    r"(?P<definition>/em><br\s*/?>)"
+    r"|(?P<paragraph>p>)"
+    r"|(?P<examples>strong>Examples:</strong>)"
+    r"|(?P<did_you_know>strong>Did you know\?(?P<did_you_know_header></strong>)?)"
+    r")"
+)
+# End of "Did you know?", searched for on its own: the scan above consumes the
+# first <br /> of "</em><br /><br />", and a terminator must still be found there
+_DID_YOU_KNOW_END_RE = re.compile(r"<br /><br />|</font>")
+_PARAGRAPH_RE = re.compile(r"(.+?)</p>", re.DOTALL)
+_USAGE_RE = re.compile(r"\s*//\s*(.+?)</p>", re.DOTALL)
+
+_SECTIONS = ("pronunciation", "part_of_speech", "definition", "usage_example", "examples", "did_you_know")
 
-def _extract_section(text:str, start_marker: str, end_markers:list[str]) -> str:
-    start_idx = text.find(start_marker)
-    if start_idx == -1:
-        return ""
-    start_idx += len(start_marker)
-    end_idx = len(text)
-    for marker in end_markers:
-        idx = text.find(marker, start_idx)
-        if idx != -1 and idx < end_idx:
-            end_idx = idx
-    return text[start_idx:end_idx].strip()
+def strip_html(text:str) -> str:
+    """Plain text of an HTML fragment, entities decoded and bare URLs dropped."""
+    # HTML tags (anchors included), then URLs
+    plain = _URL_RE.sub("", _TAG_RE.sub("", text))
+    return html.unescape(plain).strip()
 
+@perf.timed("rss.parse_description", log=False)
 def _parse_description(raw:str) -> dict[str,str]:
-    result = {
-        "pronunication": "",
-        "part_of_speech": "",
-        "definition": "",
-        "usage_example": "",
-        "examples" : "",
-        "did_you_know": ""
-    }
+    """Extract the word-of-the-day sections from an item description.
+
+    Layout of a description:
+
+        <p><strong>word</strong> \\pronunciation\\ <em>part of speech</em><br />
+        <p>definition</p>
+        <p>// usage example</p>
+        <p><strong>Examples:</strong></p> ... <p><strong>Did you know?</strong></p> ...
+
+    Section boundaries come from one pass of a combined marker pattern;
+    paragraphs are then matched in place at the marker offsets. The result
+    is the same as searching for each section on its own, which
+    tests/test_parse_description.py checks against the original parser.
+    """
+    result = dict.fromkeys(_SECTIONS, "")
     
-    # pronunciation (\word\)
-    pronunciation_match = re.search(r"\\([^\\]+)\\", raw)
+    # pronunciation (\word\) and part of speech (<em>part-of-speech</em>),
+    # both at the head of the description
+    pronunciation_match = _PRONUNCIATION_RE.search(raw)
     if pronunciation_match:
         result["pronunciation"] = pronunciation_match.group(1).strip()
-    
-    # part of speech (<em>part-of-speed-</em>)
-    pos_match = re.search(r"\\[^\\]+\\[^<]*<em>([^<]+)</em>", raw)
+    pos_match = _PART_OF_SPEECH_RE.search(raw)
     if pos_match:
         result["part_of_speech"] = pos_match.group(1).strip()
     
-    # definition (<p> definition </p>\n<p>//USAGE</p>)
-    def_match = re.search(r"</em><br\s*/?>.*?<p>(.+?)</p>", raw, re.DOTALL)
-    if def_match:
-        result["definition"] = _strip_html(def_match.group(1))
-        
-    # usage example
-    usage_match = re.search(r"<p>\s*//\s*(.+?)</p>", raw, re.DOTALL)
-    if usage_match:
-        result["usage_example"] = _strip_html(usage_match.group(1))
-        
-    # Examples
-    examples = _extract_section(raw, "<strong>Examples:</strong>", ["<strong>Did you know?"])
-    if examples:
-        result["examples"] = _strip_html(examples)
+    definition_armed = False
+    definition_done = usage_done = False
+    examples_start = examples_end = None
+    dyk_start = dyk_end = None
+    for marker in _MARKER_RE.finditer(raw):
+        kind = marker.lastgroup
+        if kind == "paragraph":
+            # definition: the first <p>...</p> after "</em><br />"
+            if definition_armed:
+                definition_armed = False
+                definition_done = True
+                def_match = _PARAGRAPH_RE.match(raw, marker.end())
+                if def_match:
+                    result["definition"] = strip_html(def_match.group(1))
+            # usage example: the first <p>// ...</p>
+            if not usage_done:
+                usage_match = _USAGE_RE.match(raw, marker.end())
+                if usage_match:
+                    usage_done = True
+                    result["usage_example"] = strip_html(usage_match.group(1))
+        elif kind == "definition":
+            if not definition_done:
+                definition_armed = True
+        elif kind == "examples":
+            if examples_start is None:
+                examples_start = marker.end()
+        elif kind == "did_you_know":
+            if examples_start is not None and examples_end is None:
+                examples_end = marker.start()
+            if dyk_start is None and marker.group("did_you_know_header"):
+                dyk_start = marker.end()
+    if dyk_start is not None:
+        end_match = _DID_YOU_KNOW_END_RE.search(raw, dyk_start)
+        if end_match:
+            dyk_end = end_match.start()
     
-    # Did you know
-    dyk = _extract_section(raw, "<strong>Did you know?</strong>", ["<br /><br />", "</font>"])
-    if dyk:
-        result["did_you_know"] = _strip_html(dyk)
+    # Examples and "Did you know?" run to the end when their terminator is missing
+    if examples_start is not None:
+        examples = raw[examples_start:examples_end].strip()
+        if examples:
+            result["examples"] = strip_html(examples)
+    if dyk_start is not None:
+        dyk = raw[dyk_start:dyk_end].strip()
+        if dyk:
+            result["did_you_know"] = strip_html(dyk)
         
     return result
 
-def fetch_latest_word() -> WordEntry:
-    feed = feedparser.parse(FEED_URL)
-    
-    # if feed is not valid
-    if not feed.entries:
-        return WordEntry(
-            word = "(no data)",
-            pronunciation="",
-            part_of_speech="",
-            definition="",
-            short_definition="",
-            usage_example="",
-            examples="",
-            did_you_know="",
-            published="",
-            link=FEED_URL
-        )
-    
-    entry = feed.entries[0]
+def _empty_entry(feed_url: str) -> WordEntry:
+    return WordEntry(
+        word = "(no data)",
+        pronunciation="",
+        part_of_speech="",
+        definition="",
+        short_definition="",
+        usage_example="",
+        examples="",
+        did_you_know="",
+        published="",
+        link=feed_url
+    )
+
+def _entry_from_item(entry: Any, feed_url: str) -> WordEntry:
+    """Build a WordEntry from a feedparser entry."""
     raw_description = getattr(entry, "summary", "") or ""
     parsed = _parse_description(raw_description)
     
@@ -110,9 +148,9 @@ def fetch_latest_word() -> WordEntry:
     if hasattr(entry, "merriam_shortdef"):
         raw_short = entry.merriam_shortdef
         if isinstance(raw_short, str):
-            short_def = _strip_html(raw_short)
+            short_def = strip_html(raw_short)
         elif isinstance(raw_short, list) and raw_short:
-            short_def = _strip_html(str(raw_short[0]))
+            short_def = strip_html(str(raw_short[0]))
     
     return WordEntry(
         word = getattr(entry, "title", "(unknown)") or "(unknown)",
@@ -124,9 +162,212 @@ def fetch_latest_word() -> WordEntry:
         examples=parsed["examples"],
         did_you_know=parsed["did_you_know"],
         published=getattr(entry, "published", "") or "",
-        link=getattr(entry, "link", FEED_URL) or FEED_URL
+        link=getattr(entry, "link", feed_url) or feed_url
     )
 
+def _local_name(tag: str) -> str:
+    # "{namespace}shortdef" -> "shortdef"
+    return tag.rsplit("}", 1)[-1]
+
+def iter_rss_fields(body: bytes) -> Iterator[Dict[str, str]]:
+    """Stream the <item>s of an RSS 2.0 document with iterparse.
+
+    Each item is yielded as child element name (namespace dropped) -> its
+    text, the first occurrence of each name. Items are read when they are
+    reached and freed afterwards, and stopping the iteration stops the
+    parse. Malformed XML raises xml.etree.ElementTree.ParseError.
+    """
+    import xml.etree.ElementTree as ET
+    for _, elem in ET.iterparse(io.BytesIO(body), events=("end",)):
+        if elem.tag != "item":
+            continue
+        fields: Dict[str, str] = {}
+        for child in elem:
+            name = _local_name(child.tag)
+            if name not in fields:
+                fields[name] = (child.text or "").strip()
+        elem.clear()
+        yield fields
+
+def _iter_rss_items(body: bytes, feed_url: str) -> Iterator[WordEntry]:
+    """Build entries from a Merriam-Webster feed's items and their description markup."""
+    for fields in iter_rss_fields(body):
+        parsed = _parse_description(fields.get("description", ""))
+        yield WordEntry(
+            word=fields.get("title") or "(unknown)",
+            pronunciation=parsed["pronunciation"],
+            part_of_speech=parsed["part_of_speech"],
+            definition=parsed["definition"],
+            short_definition=strip_html(fields.get("shortdef", "")),
+            usage_example=parsed["usage_example"],
+            examples=parsed["examples"],
+            did_you_know=parsed["did_you_know"],
+            published=fields.get("pubDate", ""),
+            link=fields.get("link") or feed_url,
+        )
+
+def parse_feed(body: bytes, feed_url: str = FEED_URL) -> Iterator[WordEntry]:
+    """Yield the feed's items lazily, newest first.
+
+    Uses the streaming reader and falls back to feedparser for documents
+    it cannot handle (malformed XML, undefined entities, non-RSS 2.0).
+    """
+    from xml.etree.ElementTree import ParseError
+    yielded = 0
+    try:
+        for entry in _iter_rss_items(body, feed_url):
+            yield entry
+            yielded += 1
+    except ParseError:
+        pass
+    else:
+        if yielded:
+            return
+    # Items already yielded before a parse error are not repeated
+    import feedparser
+    for item in feedparser.parse(body).entries[yielded:]:
+        yield _entry_from_item(item, feed_url)
+
+FeedParser = Callable[[bytes, str], Iterator[WordEntry]]
+
+_pool: Optional[Any] = None
+_pool_lock = threading.Lock()
+
+def _cache_files(feed_url: str) -> Tuple[Path, Path]:
+    """Cache files of a feed; each extra feed gets its own pair, named by URL hash."""
+    if feed_url == FEED_URL:
+        return FEED_CACHE_FILE, FEED_BODY_FILE
+    import hashlib
+    digest = hashlib.sha1(feed_url.encode("utf-8")).hexdigest()[:12]
+    return DATA_DIR / f"feed_cache_{digest}.json", DATA_DIR / f"feed_cache_{digest}.xml"
+
+def _load_feed_cache(feed_url: str) -> Dict[str, Any]:
+    """Return the cached response metadata for feed_url, or {} if there is none."""
+    try:
+        cache = json.loads(_cache_files(feed_url)[0].read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("url") != feed_url:
+        return {}
+    return cache
+
+def _save_feed_cache(feed_url: str, etag: Optional[str], last_modified: Optional[str], entries: List[WordEntry], complete: bool, body: Optional[bytes] = None) -> None:
+    """Store the validators and parsed entries, and the raw body when given.
+
+    complete is False when parsing stopped early; the remaining entries
+    are then parsed from the cached body when they are needed.
+    """
+    cache = {
+        "url": feed_url,
+        "etag": etag,
+        "last_modified": last_modified,
+        "complete": complete,
+        "entries": [asdict(entry) for entry in entries],
+    }
+    cache_file, body_file = _cache_files(feed_url)
+    try:
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        if body is not None:
+            body_file.write_bytes(body)
+        cache_file.write_text(json.dumps(cache, indent=2, ensure_ascii=False), encoding="utf-8")
+    except OSError:
+        pass
+
+def download(url: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> Tuple[int, Any, bytes]:
+    """GET url (a feed, or an archive page), conditionally if validators are given.
+
+    Returns (status, headers, body), the body decompressed.
+
+    Requests go over a process-wide pool of keep-alive connections, so
+    repeated fetches from one host skip the TCP and TLS handshakes. Error
+    statuses raise urllib.error.HTTPError.
+    """
+    global _pool
+    # http.client pulls in email and ssl; keep it off the startup path
+    import gzip
+    with _pool_lock:
+        # Feeds fetched in parallel must share one pool
+        if _pool is None:
+            from http_pool import ConnectionPool
+            _pool = ConnectionPool(FETCH_TIMEOUT)
+    headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "gzip"}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    with perf.span("rss.download", url=url, conditional=bool(etag or last_modified)):
+        status, response_headers, body = _pool.get(url, headers)
+    perf.count(f"rss.status.{status}")
+    if status == 304:
+        return 304, response_headers, b""
+    perf.observe("rss.body_bytes", len(body))
+    if response_headers.get("Content-Encoding") == "gzip":
+        body = gzip.decompress(body)
+    return status, response_headers, body
+
+def _parse_entries(body: bytes, feed_url: str, limit: Optional[int], parse: FeedParser = parse_feed) -> Tuple[List[WordEntry], bool]:
+    """Parse up to limit entries; returns them and whether the feed was exhausted."""
+    with perf.span("rss.parse", url=feed_url, bytes=len(body)):
+        entries = list(itertools.islice(parse(body, feed_url), limit))
+    perf.count("rss.entries_parsed", len(entries))
+    return entries, limit is None or len(entries) < limit
+
+def _fetch_entries(feed_url: str, limit: Optional[int] = None, parse: FeedParser = parse_feed) -> List[WordEntry]:
+    """Fetch and parse the newest feed items (all of them if limit is None).
+
+    The last response is cached on disk; requests are sent with its ETag and
+    Last-Modified validators, and a 304 reuses the cached entries without
+    parsing anything. Parsing stops after limit items. parse turns the
+    body into entries; see feeds.py for the parsers of other sources.
+    """
+    cache = _load_feed_cache(feed_url)
+    cached_entries = cache.get("entries")
+    try:
+        if cached_entries:
+            status, headers, body = download(feed_url, cache.get("etag"), cache.get("last_modified"))
+        else:
+            status, headers, body = download(feed_url)
+    except (OSError, ValueError):
+        # Offline or server error (URLError is an OSError): the last good response beats "(no data)"
+        perf.count("rss.fetch_failed")
+        return [WordEntry(**e) for e in (cached_entries or [])[:limit]]
+    
+    if status == 304 and cached_entries:
+        if cache.get("complete") or (limit is not None and len(cached_entries) >= limit):
+            return [WordEntry(**e) for e in cached_entries[:limit]]
+        # An earlier fetch stopped early; the rest is still in the cached body
+        try:
+            cached_body = _cache_files(feed_url)[1].read_bytes()
+        except OSError:
+            return [WordEntry(**e) for e in cached_entries[:limit]]
+        entries, complete = _parse_entries(cached_body, feed_url, limit, parse)
+        if entries:
+            _save_feed_cache(feed_url, cache.get("etag"), cache.get("last_modified"), entries, complete)
+        return entries
+    
+    entries, complete = _parse_entries(body, feed_url, limit, parse)
+    if entries:
+        _save_feed_cache(feed_url, headers.get("ETag"), headers.get("Last-Modified"), entries, complete, body)
+    return entries
+
+def load_cached_word(feed_url: str = FEED_URL) -> Optional[WordEntry]:
+    """Return the newest entry from the last successful fetch without touching the network."""
+    cached_entries = _load_feed_cache(feed_url).get("entries")
+    return WordEntry(**cached_entries[0]) if cached_entries else None
+
+def fetch_all_words(feed_url: str = FEED_URL, parse: FeedParser = parse_feed) -> Iterator[WordEntry]:
+    """Yield a WordEntry for every item in the feed, newest first."""
+    yield from _fetch_entries(feed_url, parse=parse)
+
+@perf.timed("rss.fetch_latest_word")
+def fetch_latest_word(feed_url: str = FEED_URL) -> WordEntry:
+    """Return the newest feed item, or a "(no data)" entry if there is none.
+
+    Parsing stops after the first item.
+    """
+    entries = _fetch_entries(feed_url, limit=1)
+    return entries[0] if entries else _empty_entry(feed_url)
+
 if __name__ == "__main__":   
     entry = fetch_latest_word()
     print(entry.word)
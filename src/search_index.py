@@ -0,0 +1,208 @@
+import bisect
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from word_entry import WordEntry
+
+# Weight of one occurrence of a term in each searchable field
+FIELD_WEIGHTS = (
+    ("word", 8),
+    ("short_definition", 3),
+    ("definition", 2),
+    ("usage_example", 1),
+    ("examples", 1),
+    ("did_you_know", 1),
+)
+# Most index terms a single prefix may expand to
+MAX_PREFIX_EXPANSIONS = 50
+INDEX_VERSION = 1
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into normalized terms (NFKC, casefolded)."""
+    return _TOKEN_RE.findall(unicodedata.normalize("NFKC", text).casefold())
+
+
+def _scored(docs: List[int], postings: Dict[int, int], idf: float) -> Iterator[Tuple[float, int]]:
+    for doc in docs:
+        yield postings[doc] * idf, doc
+
+
+class SearchIndex:
+    """Inverted index over history entries, keyed by normalized word.
+
+    Each term maps to a posting dict of doc id -> field-weighted term
+    frequency; a sorted term list serves prefix expansion. Entries are only
+    ever added, matching history, which never drops words.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._keys: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._terms: List[str] = []
+        # term -> doc ids by descending weight, built on demand for top-k queries
+        self._ranked: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._ids
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._keys)
+
+    def add(self, key: str, entry: WordEntry) -> bool:
+        """Index entry under key; returns False if key is already indexed."""
+        return self.add_many([(key, entry)]) == 1
+
+    def add_many(self, items: Iterable[Tuple[str, WordEntry]]) -> int:
+        """Index (key, entry) pairs not indexed yet; returns how many were new."""
+        added = 0
+        new_terms = []
+        with self._lock:
+            for key, entry in items:
+                if key in self._ids:
+                    continue
+                doc = self._ids[key] = len(self._keys)
+                self._keys.append(key)
+                weights: Dict[str, int] = {}
+                get = weights.get
+                for field, weight in FIELD_WEIGHTS:
+                    for term in tokenize(getattr(entry, field)):
+                        weights[term] = get(term, 0) + weight
+                for term, weight in weights.items():
+                    postings = self._postings.get(term)
+                    if postings is None:
+                        postings = self._postings[term] = {}
+                        new_terms.append(term)
+                    postings[doc] = weight
+                    self._ranked.pop(term, None)
+                added += 1
+            if new_terms:
+                # The existing list is one sorted run, so this is a linear merge
+                self._terms.extend(new_terms)
+                self._terms.sort()
+        return added
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """Return the keys of entries matching every term of query, best first.
+
+        The last term also matches as a prefix, so a query can be run on each
+        keystroke. Scores sum weight * idf over the query terms.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        with self._lock:
+            matches = [self._expand(term, prefix=(i == len(terms) - 1)) for i, term in enumerate(terms)]
+            if not all(matches):
+                return []
+            if len(matches) == 1 and limit is not None:
+                return self._top(matches[0], limit)
+            # Intersect from the rarest term so later terms only probe candidates
+            matches.sort(key=lambda m: sum(len(p) for _, p, _ in m))
+            first = matches[0]
+            if len(first) == 1:
+                _, postings, idf = first[0]
+                scores = {doc: weight * idf for doc, weight in postings.items()}
+            else:
+                scores = {}
+                for _, postings, idf in first:
+                    for doc, weight in postings.items():
+                        score = weight * idf
+                        if score > scores.get(doc, 0.0):
+                            scores[doc] = score
+            for match in matches[1:]:
+                narrowed = {}
+                for doc, score in scores.items():
+                    best = 0.0
+                    for _, postings, idf in match:
+                        weight = postings.get(doc)
+                        if weight is not None and weight * idf > best:
+                            best = weight * idf
+                    if best:
+                        narrowed[doc] = score + best
+                scores = narrowed
+                if not scores:
+                    return []
+            # Both keep insertion (oldest doc first) order among equal scores
+            if limit is None:
+                ranked = sorted(scores.items(), key=itemgetter(1), reverse=True)
+            else:
+                ranked = heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+            return [self._keys[doc] for doc, _ in ranked]
+
+    def _top(self, match: List[Any], limit: int) -> List[str]:
+        """Top limit keys of a single-term query without scoring every match.
+
+        Walks the expansions' weight-ordered doc lists in one merge, so the
+        cost depends on limit rather than on how many entries match.
+        """
+        streams = []
+        for term, postings, idf in match:
+            ranked = self._ranked.get(term)
+            if ranked is None:
+                ranked = self._ranked[term] = sorted(postings, key=postings.__getitem__, reverse=True)
+            streams.append(_scored(ranked, postings, idf))
+        result = []
+        seen = set()
+        # A doc's first appearance carries its best score over the expansions
+        for _, doc in heapq.merge(*streams, key=itemgetter(0), reverse=True):
+            if doc not in seen:
+                seen.add(doc)
+                result.append(self._keys[doc])
+                if len(result) == limit:
+                    break
+        return result
+
+    def _expand(self, term: str, prefix: bool) -> List[Any]:
+        """Return (term, postings, idf) for term, plus its prefix expansions if asked."""
+        total = len(self._keys)
+        found = []
+        if prefix:
+            start = bisect.bisect_left(self._terms, term)
+            for candidate in self._terms[start:start + MAX_PREFIX_EXPANSIONS]:
+                if not candidate.startswith(term):
+                    break
+                found.append(candidate)
+        elif term in self._postings:
+            found.append(term)
+        return [
+            (t, self._postings[t], math.log(1.0 + total / len(self._postings[t])))
+            for t in found
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the index in its on-disk layout; postings are flat id, weight lists."""
+        with self._lock:
+            postings = {
+                term: [n for pair in docs.items() for n in pair]
+                for term, docs in self._postings.items()
+            }
+            return {"version": INDEX_VERSION, "keys": list(self._keys), "postings": postings}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SearchIndex":
+        """Rebuild an index saved by to_dict; unknown layouts give an empty index."""
+        index = cls()
+        if data.get("version") != INDEX_VERSION:
+            return index
+        index._keys = list(data["keys"])
+        index._ids = {key: doc for doc, key in enumerate(index._keys)}
+        index._postings = {
+            term: dict(zip(flat[::2], flat[1::2]))
+            for term, flat in data["postings"].items()
+        }
+        index._terms = sorted(index._postings)
+        return index
@@ -0,0 +1,243 @@
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List
+
+from paths import DATA_DIR, DATA_FILE
+from storage import dict_to_entry, entry_to_dict, load_data, word_key
+from word_entry import WordEntry
+
+DB_FILE = DATA_DIR / "wotd.db"
+
+COLUMNS = (
+    "word",
+    "pronunciation",
+    "part_of_speech",
+    "definition",
+    "short_definition",
+    "usage_example",
+    "examples",
+    "did_you_know",
+    "published",
+    "link",
+    "published_at",
+)
+
+SCHEMA_VERSION = 1
+
+# Rows fetched at a time by the iter_ readers
+ITER_BATCH = 500
+
+# History and favorites share a layout; rows are ordered newest first by id
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS {table} (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    word_key TEXT NOT NULL,
+    word TEXT NOT NULL,
+    pronunciation TEXT NOT NULL DEFAULT '',
+    part_of_speech TEXT NOT NULL DEFAULT '',
+    definition TEXT NOT NULL DEFAULT '',
+    short_definition TEXT NOT NULL DEFAULT '',
+    usage_example TEXT NOT NULL DEFAULT '',
+    examples TEXT NOT NULL DEFAULT '',
+    did_you_know TEXT NOT NULL DEFAULT '',
+    published TEXT NOT NULL DEFAULT '',
+    link TEXT NOT NULL DEFAULT '',
+    published_at INTEGER NOT NULL DEFAULT 0
+);
+CREATE UNIQUE INDEX IF NOT EXISTS {table}_word_key ON {table}(word_key);
+CREATE INDEX IF NOT EXISTS {table}_published_at ON {table}(published_at);
+"""
+
+_SELECT = "SELECT word_key, " + ", ".join(COLUMNS) + " FROM {table} ORDER BY id DESC"
+# History reads newest published first; equal dates keep insertion order
+_SELECT_HISTORY = "SELECT word_key, " + ", ".join(COLUMNS) + " FROM history {where}ORDER BY published_at DESC, id DESC"
+_INSERT = (
+    "INSERT OR IGNORE INTO {table} (word_key, " + ", ".join(COLUMNS) + ") "
+    "VALUES (?, " + ", ".join("?" * len(COLUMNS)) + ")"
+)
+
+
+def _row(entry: WordEntry) -> tuple:
+    record = entry_to_dict(entry)
+    return (word_key(entry.word),) + tuple(record[c] for c in COLUMNS)
+
+
+def connect(db_path: Path = DB_FILE) -> sqlite3.Connection:
+    """Open the database in WAL mode and make sure the schema exists."""
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path), isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA.format(table="history") + _SCHEMA.format(table="favorites"))
+    conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+    return conn
+
+
+def migrate_from_json(conn: sqlite3.Connection, data: Dict[str, Any]) -> int:
+    """Copy the wotd.json layout into the database in one transaction.
+
+    Existing words are kept. Returns the number of rows inserted.
+    """
+    inserted = 0
+    with conn:
+        conn.execute("BEGIN")
+        for table in ("history", "favorites"):
+            # JSON lists are newest first; insert oldest first so ids ascend with age
+            rows = [_row(dict_to_entry(d)) for d in reversed(data.get(table, []))]
+            cursor = conn.executemany(_INSERT.format(table=table), rows)
+            inserted += max(cursor.rowcount, 0)
+    return inserted
+
+
+class SqliteRepository:
+    """Storage backend on a local SQLite database.
+
+    Dedupe and favorite toggles are single-row operations on the unique word
+    index. A new database is seeded from wotd.json on first open. Rows are
+    turned into entries once: later reads return the same WordEntry objects,
+    shared between history and favorites where the rows are equal.
+    """
+
+    def __init__(self, db_path: Path = DB_FILE) -> None:
+        is_new = not db_path.exists()
+        self._lock = threading.Lock()
+        # Word key -> last entry built for it, reused while its row is unchanged
+        self._entries: Dict[str, WordEntry] = {}
+        self._conn = connect(db_path)
+        if is_new and DATA_FILE.exists():
+            migrate_from_json(self._conn, load_data())
+
+    def flush(self) -> None:
+        # Every mutation commits immediately
+        pass
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _entry(self, key: str, row: tuple, cache: bool = True) -> WordEntry:
+        """Return the cached entry for a (word, ..., link) row, caching a new one if it changed.
+
+        With cache False a changed or uncached row gets a new entry that is
+        not kept.
+        """
+        entry = self._entries.get(key)
+        # Compare the fields in place; building a WordEntry per row is what the cache avoids
+        if entry is None or row != (entry.word, entry.pronunciation, entry.part_of_speech, entry.definition, entry.short_definition,
+                                    entry.usage_example, entry.examples, entry.did_you_know, entry.published, entry.link,
+                                    entry.published_at):
+            word, pronunciation, part_of_speech, *rest = row
+            entry = WordEntry(word, pronunciation, sys.intern(part_of_speech), *rest)
+            if cache:
+                self._entries[key] = entry
+        return entry
+
+    def _select(self, query: str, params: tuple = ()) -> List[WordEntry]:
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+            return [self._entry(row[0], row[1:]) for row in rows]
+
+    def _iter_select(self, query: str, params: tuple = ()) -> Iterator[WordEntry]:
+        """Yield the entries of query's rows, walking its cursor ITER_BATCH rows at a time.
+
+        Entries not already cached are not added to the cache, so a walk of
+        the whole table holds one batch.
+        """
+        with self._lock:
+            cursor = self._conn.execute(query, params)
+        try:
+            while True:
+                with self._lock:
+                    entries = [self._entry(row[0], row[1:], cache=False) for row in cursor.fetchmany(ITER_BATCH)]
+                if not entries:
+                    return
+                yield from entries
+        finally:
+            cursor.close()
+
+    def add_history(self, entry: WordEntry) -> None:
+        with self._lock:
+            self._conn.execute(_INSERT.format(table="history"), _row(entry))
+
+    def _add_many(self, table: str, entries: Iterable[WordEntry]) -> List[WordEntry]:
+        added = []
+        ids = []
+        insert = _INSERT.format(table=table)
+        with self._lock, self._conn:
+            # Take the write lock up front: a deferred transaction that has to
+            # upgrade fails at once if another process wrote in the meantime
+            self._conn.execute("BEGIN IMMEDIATE")
+            # Rows are inserted as entries are read; the unique index skips
+            # words already stored, or repeated in entries (the first is kept)
+            for entry in entries:
+                cursor = self._conn.execute(insert, _row(entry))
+                if cursor.rowcount:
+                    added.append(entry)
+                    ids.append(cursor.lastrowid)
+            if len(ids) > 1:
+                # Batches arrive newest first, so the new rows got ids in the
+                # wrong order; mirror them within their range so ids ascend with
+                # age. Negating first keeps the primary key unique throughout.
+                lo, hi = ids[0], ids[-1]
+                self._conn.execute(f"UPDATE {table} SET id = -id WHERE id BETWEEN ? AND ?", (lo, hi))
+                self._conn.execute(f"UPDATE {table} SET id = ? + id WHERE id BETWEEN ? AND ?", (lo + hi, -hi, -lo))
+        return added
+
+    def add_history_many(self, entries: Iterable[WordEntry]) -> List[WordEntry]:
+        """Add the entries not yet in history; return those added, newest first."""
+        return self._add_many("history", entries)
+
+    def add_favorites_many(self, entries: Iterable[WordEntry]) -> List[WordEntry]:
+        """Add the entries not yet in favorites, the first on top; return those added."""
+        return self._add_many("favorites", entries)
+
+    def toggle_favorite(self, entry: WordEntry) -> bool:
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            cursor = self._conn.execute("DELETE FROM favorites WHERE word_key = ?", (word_key(entry.word),))
+            if cursor.rowcount:
+                return False
+            self._conn.execute(_INSERT.format(table="favorites"), _row(entry))
+            return True
+
+    def get_history(self) -> List[WordEntry]:
+        return self._select(_SELECT_HISTORY.format(where=""))
+
+    def get_history_between(self, start: int, end: int) -> List[WordEntry]:
+        """Return history entries published in [start, end), newest first; a range scan of the date index."""
+        return self._select(_SELECT_HISTORY.format(where="WHERE published_at >= ? AND published_at < ? "), (start, end))
+
+    def get_history_by_keys(self, keys: Iterable[str]) -> List[WordEntry]:
+        """Return the history entries for word keys, in the order given."""
+        keys = list(keys)
+        found = {}
+        select = "SELECT word_key, " + ", ".join(COLUMNS) + " FROM history WHERE word_key IN ({})"
+        with self._lock:
+            # Stay under SQLite's limit on bound parameters
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                for row in self._conn.execute(select.format(", ".join("?" * len(chunk))), chunk):
+                    found[row[0]] = self._entry(row[0], row[1:])
+        return [found[key] for key in keys if key in found]
+
+    def get_favorites(self) -> List[WordEntry]:
+        return self._select(_SELECT.format(table="favorites"))
+
+    def iter_history(self) -> Iterator[WordEntry]:
+        return self._iter_select(_SELECT_HISTORY.format(where=""))
+
+    def iter_favorites(self) -> Iterator[WordEntry]:
+        return self._iter_select(_SELECT.format(table="favorites"))
+
+    def is_favorite(self, word: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM favorites WHERE word_key = ? LIMIT 1", (word_key(word),)).fetchone()
+        return row is not None
+
+
+if __name__ == "__main__":
+    conn = connect()
+    count = migrate_from_json(conn, load_data())
+    print(f"Migrated {count} records from {DATA_FILE} to {DB_FILE}")
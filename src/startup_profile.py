@@ -0,0 +1,60 @@
+import json
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class StartupProfile:
+    """Wall-clock timings of startup phases, relative to process start.
+
+    Timings are always collected (two perf_counter calls per phase); the
+    JSON report is only written when a report path was given.
+    """
+
+    def __init__(self, process_start: float, report_path: Optional[Path] = None) -> None:
+        self.process_start = process_start
+        self.report_path = report_path
+        self.phases: List[Dict[str, Any]] = []
+        self.marks: Dict[str, float] = {}
+        self._written = False
+
+    def _ms(self, t: float) -> float:
+        return round((t - self.process_start) * 1000, 2)
+
+    def add_phase(self, name: str, start: float, end: float) -> None:
+        self.phases.append({"name": name, "start_ms": self._ms(start), "duration_ms": round((end - start) * 1000, 2)})
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(name, start, time.perf_counter())
+
+    def mark(self, name: str) -> float:
+        """Record a milestone (first paint, first refresh) and return its offset in ms."""
+        offset = self.marks[name] = self._ms(time.perf_counter())
+        return offset
+
+    def write(self) -> None:
+        """Write the report once, if enabled."""
+        if self.report_path is None or self._written:
+            return
+        self._written = True
+        report = {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "frozen": bool(getattr(sys, "frozen", False)),
+            "python": sys.version.split()[0],
+            "platform": sys.platform,
+            "phases": self.phases,
+            "marks": self.marks,
+        }
+        try:
+            self.report_path.parent.mkdir(parents=True, exist_ok=True)
+            self.report_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        except OSError:
+            pass
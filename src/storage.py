@@ -1,20 +1,66 @@
+import atexit
+import bisect
+import itertools
 import json
+import os
 import sys
+import tempfile
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-from rss_client import WordEntry
+import perf
+from file_lock import FileLock
+from paths import DATA_DIR, DATA_FILE
+from word_entry import WordEntry
 
-if getattr(sys, "frozen", False):
-    BASE_DIR = Path(sys.executable).parent
-else:
-    BASE_DIR = Path(__file__).resolve().parent.parent
+# Seconds without mutations before pending changes are written
+FLUSH_DELAY = 0.5
+# Upper bound on how long a steady stream of mutations can defer a write
+FLUSH_MAX_DELAY = 5.0
+# "json" (default), "journal" or "sqlite"
+STORAGE_BACKEND = os.environ.get("VERBA_STORAGE", "json").lower()
+# Full-text index over history, rebuilt from history if missing or stale
+SEARCH_INDEX_FILE = DATA_DIR / "search_index.json"
+# Words indexed since search_index.json was written before it is written
+# again; fewer are cheaper to index again from history on the next load
+SEARCH_INDEX_SAVE_MIN = 500
+# Entries add_history_many reads and stores at a time
+ADD_BATCH = 1000
 
-DATA_DIR = BASE_DIR / "data"
-DATA_FILE = DATA_DIR / "wotd.json"
+
+@dataclass(frozen=True)
+class HistoryInserted:
+    """New words were added to history, newest first.
+
+    History is in publication order, so an older word (e.g. a backfilled
+    one) lands below newer ones rather than at the top.
+    """
+    entries: Tuple[WordEntry, ...]
+
+
+@dataclass(frozen=True)
+class FavoriteAdded:
+    """A word was added to the top of favorites."""
+    entry: WordEntry
+
+
+@dataclass(frozen=True)
+class FavoriteRemoved:
+    """The favorite with the same word key as entry was removed."""
+    entry: WordEntry
+
+
+ChangeEvent = Union[HistoryInserted, FavoriteAdded, FavoriteRemoved]
+
+_subscribers: List[Callable[[ChangeEvent], None]] = []
 
 
 # Load data
+@perf.timed("storage.load")
 def load_data() -> Dict[str, Any]:
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     if not DATA_FILE.exists():
@@ -22,43 +68,49 @@ def load_data() -> Dict[str, Any]:
     try:
         return json.loads(DATA_FILE.read_text(encoding="utf-8"))
     except json.JSONDecodeError:
+        # Keep the unreadable file aside so the next save cannot destroy it
+        os.replace(DATA_FILE, DATA_FILE.with_name(DATA_FILE.name + ".corrupt"))
         return {"history": [], "favorites": []}
 
 # Save data
+@perf.timed("storage.save")
 def save_data(data: Dict[str, Any]) -> None:
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
-    DATA_FILE.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
-    
-def add_history(entry:WordEntry) -> None:
-    # Skip empty "word" obj
-    if not entry.word or entry.word.strip() in {"(no data)", "(unknown)"}:
-        return
-    
-    data = load_data()
-    history = data.get("history", [])
-    record = {
-        "word": entry.word,
-        "pronunciation": entry.pronunciation,
-        "part_of_speech": entry.part_of_speech,
-        "definition": entry.definition,
-        "short_definition": entry.short_definition,
-        "usage_example": entry.usage_example,
-        "examples": entry.examples,
-        "did_you_know": entry.did_you_know,
-        "published": entry.published,
-        "link": entry.link,
-    }
-    # Check words in history to avoid duplicates
-    if not any(h.get("word") == entry.word for h in history):
-        history.insert(0, record)
-    data["history"] = history
-    save_data(data)
-    
+    write_text(_serialize(data))
+
+def _serialize(data: Dict[str, Any]) -> str:
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+def file_signature(path: Path) -> Optional[Tuple[int, int, int]]:
+    """Return what changes when path is rewritten or replaced, or None if it is missing."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+def write_text(text: str, path: Optional[Path] = None) -> None:
+    """Replace wotd.json (or path) atomically: a crash leaves either the old or the new file.
+
+    Each write gets its own temporary file, so concurrent writers of one
+    path never write into each other's.
+    """
+    path = path or DATA_FILE
+    perf.observe("storage.write_bytes", len(text))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    f = tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=path.parent, prefix=path.name + ".", suffix=".tmp", delete=False)
+    try:
+        with f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f.name, path)
+    except BaseException:
+        os.remove(f.name)
+        raise
     
-def toggle_favorite(entry: WordEntry) -> bool:
-    data = load_data()
-    favorites = data.get("favorites", [])
-    record = {
+def entry_to_dict(entry: WordEntry) -> Dict[str, str]:
+    """Convert a WordEntry to the record layout stored in wotd.json."""
+    return {
         "word": entry.word,
         "pronunciation": entry.pronunciation,
         "part_of_speech": entry.part_of_speech,
@@ -69,24 +121,16 @@ def toggle_favorite(entry: WordEntry) -> bool:
         "did_you_know": entry.did_you_know,
         "published": entry.published,
         "link": entry.link,
+        "published_at": entry.published_at,
     }
-    existing = next((f for f in favorites if f.get("word") == entry.word), None)
-    if existing:
-        favorites.remove(existing)
-        is_favorite = False
-    else:
-        favorites.insert(0, record)
-        is_favorite = True
-    data["favorites"] = favorites
-    save_data(data)
-    return is_favorite
-
-def _dict_to_entry(d: Dict[str, str]) -> WordEntry:
+
+def dict_to_entry(d: Dict[str, str]) -> WordEntry:
     """Convert a dictionary to a WordEntry dataclass."""
     return WordEntry(
         word=d.get("word", ""),
         pronunciation=d.get("pronunciation", ""),
-        part_of_speech=d.get("part_of_speech", ""),
+        # A handful of values repeated across the whole history; share one copy
+        part_of_speech=sys.intern(d.get("part_of_speech", "")),
         definition=d.get("definition", ""),
         short_definition=d.get("short_definition", ""),
         usage_example=d.get("usage_example", ""),
@@ -94,18 +138,555 @@ def _dict_to_entry(d: Dict[str, str]) -> WordEntry:
         did_you_know=d.get("did_you_know", ""),
         published=d.get("published", ""),
         link=d.get("link", ""),
+        # Records saved before the field existed get it parsed on load
+        published_at=d.get("published_at", 0),
     )
 
+def _published_key(entry: WordEntry) -> int:
+    return entry.published_at
+
+def _is_placeholder(entry: WordEntry) -> bool:
+    # Skip empty "word" obj
+    return not entry.word or entry.word.strip() in {"(no data)", "(unknown)"}
+
+def word_key(word: str) -> str:
+    """Dedupe key for a word: Unicode-normalized, case-folded and trimmed."""
+    return unicodedata.normalize("NFKC", word).casefold().strip()
+
+def _index_records(records: List[Dict[str, str]]) -> Dict[str, Dict[str, str]]:
+    """Index a newest-first record list by word key, oldest first.
+
+    Dicts keep insertion order, so appending a record makes it the newest
+    and reading the values in reverse restores the stored order.
+    """
+    index: Dict[str, Dict[str, str]] = {}
+    for record in reversed(records):
+        index[word_key(record.get("word", ""))] = record
+    return index
+
+
+class JsonRepository:
+    """Process-wide, in-memory view of wotd.json.
+
+    The file is read once on first use and reads are served from memory.
+    History and favorites are held as word key -> WordEntry dicts, so dedupe,
+    membership checks and favorite toggles are O(1). History is read newest
+    published first, from a sorted list that also serves date range queries
+    by bisection; favorites in the order they were added. An entry is stored once
+    and returned by identity, and a favorite equal to its history entry is
+    the same object, so the tabs' lists share entries instead of copying them.
+    Mutations mark the state dirty and schedule a debounced write, so a
+    burst of changes costs a single save; pending changes are flushed at
+    interpreter exit.
+
+    Several processes (the GUI, verba commands, the daemon) may share the
+    file. Writes hold an exclusive lock on wotd.lock, and if wotd.json was
+    replaced since this process last read or wrote it, the new file is
+    loaded and the mutations not saved yet are replayed on top, so neither
+    side's changes are lost.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        # "history" and "favorites" indexes; None until first use
+        self._lists: Optional[Dict[str, Dict[str, WordEntry]]] = None
+        # Other top-level keys of wotd.json, written back untouched
+        self._meta: Dict[str, Any] = {}
+        # Newest-first lists of the indexes' entries, dropped when a list changes.
+        # History's is sorted by published_at and doubles as the date index.
+        self._entries: Dict[str, List[WordEntry]] = {}
+        self._dirty_since: Optional[float] = None
+        self._timer: Optional[threading.Timer] = None
+        # Held across processes while wotd.json (or the journal) is written
+        self._file_lock = FileLock(DATA_FILE.with_suffix(".lock"))
+        # Signature of wotd.json as last read or written by this process
+        self._file_state: Optional[Tuple[int, int, int]] = None
+        # Mutations (see _changed) made since the last write, oldest first
+        self._pending: List[Dict[str, Any]] = []
+
+    def _load(self) -> None:
+        # Taken before reading: if the file is replaced in between, the
+        # next write merges it again, which is harmless
+        self._file_state = file_signature(DATA_FILE)
+        self._populate(load_data())
+
+    def _populate(self, data: Dict[str, Any]) -> None:
+        """Index a wotd.json document; other top-level keys are kept as they are."""
+        self._entries.clear()
+        self._lists = {"history": {}, "favorites": {}}
+        for name, index in self._lists.items():
+            for key, record in _index_records(data.pop(name, [])).items():
+                index[key] = self._shared(key, dict_to_entry(record))
+        self._meta = data
+
+    def _index(self, name: str) -> Dict[str, WordEntry]:
+        if self._lists is None:
+            self._load()
+        return self._lists[name]
+
+    def _shared(self, key: str, entry: WordEntry) -> WordEntry:
+        """Return the stored entry equal to entry, if either list has one, else entry."""
+        for index in self._lists.values():
+            stored = index.get(key)
+            if stored is not None and stored == entry:
+                return stored
+        return entry
+
+    def _insert(self, name: str, entries: List[WordEntry]) -> List[WordEntry]:
+        """Add entries (newest first) whose word is not in the list yet; return them as stored."""
+        index = self._index(name)
+        stored = []
+        for entry in reversed(entries):
+            key = word_key(entry.word)
+            if key not in index:
+                index[key] = self._shared(key, entry)
+                stored.append(index[key])
+        stored.reverse()
+        return stored
+
+    def _snapshot(self) -> Dict[str, Any]:
+        """Return the state in the wotd.json layout, lists newest first.
+
+        The lists hold the entries themselves, which are immutable, so the
+        snapshot is cheap to take under self._lock and stays valid once it
+        is released; _records turns it into what is written.
+        """
+        lists = {name: list(reversed(index.values())) for name, index in self._lists.items()}
+        return {**lists, **self._meta}
+
+    @staticmethod
+    def _records(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a snapshot with its entry lists as records."""
+        return {key: [entry_to_dict(e) for e in value] if key in ("history", "favorites") else value
+                for key, value in snapshot.items()}
+
+    def _apply(self, op: Dict[str, Any]) -> None:
+        """Apply a mutation (see _changed), or a journal record of one, to the indexes."""
+        kind = op["op"]
+        if kind in ("history_add", "favorites_add"):
+            entries = op["entries"] if "entries" in op else [dict_to_entry(r) for r in op["records"]]
+            self._insert("history" if kind == "history_add" else "favorites", entries)
+        elif kind == "favorite_add":
+            self._insert("favorites", [dict_to_entry(op["record"])])
+        elif kind == "favorite_remove":
+            self._index("favorites").pop(word_key(op["word"]), None)
+        elif kind == "favorite_toggle":
+            self._toggle(dict_to_entry(op["record"]))
+        self._entries.clear()
+
+    def _merge(self) -> None:
+        """Reload wotd.json as another process left it and replay the pending mutations.
+
+        A file that cannot be read is left for the write to replace, as a
+        first load would.
+        """
+        try:
+            data = json.loads(DATA_FILE.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        perf.count("storage.merges")
+        self._populate(data)
+        for op in self._pending:
+            self._apply(op)
+
+    def _sorted(self, name: str) -> List[WordEntry]:
+        """Return the cached newest-first list; callers hold the lock and must not modify it."""
+        entries = self._entries.get(name)
+        if entries is None:
+            entries = self._entries[name] = list(reversed(self._index(name).values()))
+            if name == "history":
+                # Mostly in order already, which sort handles in close to O(n);
+                # it is stable, so equal dates keep the order they were added in
+                entries.sort(key=_published_key, reverse=True)
+        return entries
+
+    def _get_entries(self, name: str) -> List[WordEntry]:
+        with self._lock:
+            return list(self._sorted(name))
+
+    def _iter_entries(self, name: str) -> Iterator[WordEntry]:
+        with self._lock:
+            entries = self._sorted(name)
+        # A mutation drops the cached list rather than changing it, so this
+        # walks the state as of the first read without copying it
+        yield from entries
+
+    def _changed(self, name: str, op: Dict[str, Any]) -> None:
+        """Called after each mutation of the named list.
+
+        op describes the mutation: history_add or favorites_add with the new
+        entries (newest first), favorite_add with the record,
+        favorite_remove with the word, or favorite_toggle with the record.
+        Entries are logged as records, the layout _apply replays.
+        """
+        self._entries.pop(name, None)
+        self._pending.append(op)
+        now = time.monotonic()
+        if self._dirty_since is None:
+            self._dirty_since = now
+        elif self._timer is not None and now - self._dirty_since >= FLUSH_MAX_DELAY:
+            # Let the pending timer fire instead of deferring it again
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(FLUSH_DELAY, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self) -> None:
+        """Write pending changes to disk now, merging any written by other processes."""
+        with self._flush_lock:
+            self._lock.acquire()
+            try:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if self._dirty_since is None or self._lists is None:
+                    return
+                # Lock order is always self._lock, then the file lock
+                with perf.span("storage.flush", mutations=len(self._pending)), self._file_lock:
+                    if file_signature(DATA_FILE) != self._file_state:
+                        self._merge()
+                    snapshot = self._snapshot()
+                    self._dirty_since = None
+                    written = len(self._pending)
+                    # Readers and mutations need not wait for serializing or the disk
+                    self._lock.release()
+                    try:
+                        write_text(_serialize(self._records(snapshot)))
+                        self._file_state = file_signature(DATA_FILE)
+                    finally:
+                        self._lock.acquire()
+                # Mutations made during the write stay pending for the next one
+                del self._pending[:written]
+            finally:
+                self._lock.release()
+
+    def _mutate(self, name: str, op: Dict[str, Any], entries: List[WordEntry]) -> List[WordEntry]:
+        # Store the entry objects themselves; op is only what gets logged
+        stored = self._insert(name, entries)
+        self._changed(name, op)
+        return stored
+
+    def add_history(self, entry: WordEntry) -> None:
+        self.add_history_many([entry])
+
+    def _add_many(self, name: str, kind: str, entries: Iterable[WordEntry]) -> List[WordEntry]:
+        """Add the entries whose word is not in the list yet, as one mutation."""
+        with self._lock:
+            index = self._index(name)
+            seen = set()
+            added = []
+            for entry in entries:
+                key = word_key(entry.word)
+                if key in index or key in seen:
+                    continue
+                seen.add(key)
+                added.append(entry)
+            if not added:
+                return added
+            return self._mutate(name, {"op": kind, "entries": added}, added)
+
+    def add_history_many(self, entries: Iterable[WordEntry]) -> List[WordEntry]:
+        """Add the entries not yet in history; return those added, newest first."""
+        return self._add_many("history", "history_add", entries)
+
+    def add_favorites_many(self, entries: Iterable[WordEntry]) -> List[WordEntry]:
+        """Add the entries not yet in favorites, the first on top; return those added."""
+        return self._add_many("favorites", "favorites_add", entries)
+
+    def _toggle(self, entry: WordEntry) -> bool:
+        """Flip entry's favorite status in the index; return whether it is now a favorite."""
+        key = word_key(entry.word)
+        favorites = self._index("favorites")
+        if key in favorites:
+            del favorites[key]
+            return False
+        self._insert("favorites", [entry])
+        return True
+
+    def toggle_favorite(self, entry: WordEntry) -> bool:
+        with self._lock:
+            is_fav = self._toggle(entry)
+            # Logged as a toggle rather than its outcome: replayed after a
+            # merge it flips the word again, so a toggle another process
+            # saved in the meantime is not undone
+            self._changed("favorites", {"op": "favorite_toggle", "record": entry_to_dict(entry)})
+            return is_fav
+
+    def get_history(self) -> List[WordEntry]:
+        return self._get_entries("history")
+
+    def get_history_by_keys(self, keys: Iterable[str]) -> List[WordEntry]:
+        """Return the history entries for word keys, in the order given."""
+        with self._lock:
+            history = self._index("history")
+            return [history[key] for key in keys if key in history]
+
+    def get_history_between(self, start: int, end: int) -> List[WordEntry]:
+        """Return history entries published in [start, end), newest first, in O(log n + k)."""
+        with self._lock:
+            history = self._sorted("history")
+            # The list is descending by date, so bisect on the negated date
+            lo = bisect.bisect_right(history, -end, key=lambda e: -e.published_at)
+            hi = bisect.bisect_right(history, -start, key=lambda e: -e.published_at)
+            return history[lo:hi]
+
+    def get_favorites(self) -> List[WordEntry]:
+        return self._get_entries("favorites")
+
+    def iter_history(self) -> Iterator[WordEntry]:
+        return self._iter_entries("history")
+
+    def iter_favorites(self) -> Iterator[WordEntry]:
+        return self._iter_entries("favorites")
+
+    def is_favorite(self, word: str) -> bool:
+        with self._lock:
+            return word_key(word) in self._index("favorites")
+
+
+_repo: Optional[Any] = None
+_search: Optional[Any] = None
+_fuzzy: Optional[Any] = None
+# Held while the search or fuzzy index is loaded or built, and while the search index is saved
+_search_lock = threading.Lock()
+_fuzzy_lock = threading.Lock()
+_search_save_lock = threading.Lock()
+# Words in search_index.json as last read or written
+_search_saved = 0
+
+
+def _repository() -> Any:
+    """Return the process-wide repository for the configured backend."""
+    global _repo
+    if _repo is None:
+        if STORAGE_BACKEND == "sqlite":
+            from sqlite_storage import SqliteRepository
+            _repo = SqliteRepository()
+        elif STORAGE_BACKEND == "journal":
+            from journal_storage import JournalRepository
+            _repo = JournalRepository()
+        else:
+            _repo = JsonRepository()
+        atexit.register(_repo.flush)
+    return _repo
+
+
+def subscribe(callback: Callable[[ChangeEvent], None]) -> Callable[[], None]:
+    """Call callback with a ChangeEvent after every history or favorites change.
+
+    Callbacks run synchronously on the thread that made the change, after
+    the change is visible to readers. Returns a function that unsubscribes.
+    """
+    _subscribers.append(callback)
+    return lambda: _subscribers.remove(callback)
+
+
+def _publish(event: ChangeEvent) -> None:
+    for callback in list(_subscribers):
+        callback(event)
+
+
+def _search_index() -> Any:
+    """Return the history search index, loading or building it on first use.
+
+    The saved index is brought up to date with history on load, so entries
+    added while it was not loaded are picked up; one that lists words not
+    in history (e.g. after wotd.json was replaced) is rebuilt. Callers on
+    other threads wait for the first load instead of starting their own.
+    """
+    global _search, _search_saved
+    if _search is None:
+        with _search_lock:
+            if _search is None:
+                from search_index import SearchIndex
+                index = SearchIndex()
+                try:
+                    index = SearchIndex.from_dict(json.loads(SEARCH_INDEX_FILE.read_text(encoding="utf-8")))
+                except (OSError, ValueError, KeyError, TypeError):
+                    pass
+                history = {word_key(entry.word): entry for entry in get_history()}
+                if not all(key in history for key in index.keys()):
+                    index = SearchIndex()
+                _search_saved = len(index)
+                index.add_many(history.items())
+                _search = index
+                # add_history_many skipped the index until now; history only grows
+                latest = get_history()
+                if len(latest) != len(history):
+                    index.add_many((word_key(entry.word), entry) for entry in latest)
+                atexit.register(_save_search_index)
+    return _search
+
+
+def _save_search_index() -> None:
+    """Write search_index.json once SEARCH_INDEX_SAVE_MIN words were indexed since it was."""
+    global _search_saved
+    with _search_save_lock:
+        if _search is None or len(_search) - _search_saved < SEARCH_INDEX_SAVE_MIN:
+            return
+        count = len(_search)
+        write_text(json.dumps(_search.to_dict(), ensure_ascii=False, separators=(",", ":")), SEARCH_INDEX_FILE)
+        _search_saved = count
+
+
+def search_index_ready() -> bool:
+    """Whether search_history can answer without loading or building the index first."""
+    return _search is not None
+
+
+def fuzzy_index_ready() -> bool:
+    """Whether fuzzy_lookup can answer without building the index first."""
+    return _fuzzy is not None
+
+
+def warm_indexes() -> threading.Thread:
+    """Load or build the search and fuzzy indexes on a background thread, which is returned.
+
+    Meant for GUI startup, so the first search does not wait for them. A
+    freshly built search index is saved from that thread too.
+    """
+    def warm() -> None:
+        _search_index()
+        _save_search_index()
+        _fuzzy_index()
+
+    thread = threading.Thread(target=warm, name="verba-indexes", daemon=True)
+    thread.start()
+    return thread
+
+
+def _fuzzy_index() -> Any:
+    """Return the trigram index over history and favorite words, built on first use.
+
+    Callers on other threads wait for the first build instead of starting their own.
+    """
+    global _fuzzy
+    if _fuzzy is None:
+        with _fuzzy_lock:
+            if _fuzzy is None:
+                from fuzzy_index import TrigramIndex
+                index = TrigramIndex()
+                sizes = []
+                for entries in (get_history(), get_favorites()):
+                    index.add_many((word_key(entry.word), entry.word) for entry in entries)
+                    sizes.append(len(entries))
+                _fuzzy = index
+                # Words stored during the build skipped the index until now
+                for size, entries in zip(sizes, (get_history(), get_favorites())):
+                    if len(entries) != size:
+                        index.add_many((word_key(entry.word), entry.word) for entry in entries)
+    return _fuzzy
+
+
+def flush() -> None:
+    """Write pending changes to disk now."""
+    _repository().flush()
+    _save_search_index()
+
+def add_history(entry:WordEntry) -> None:
+    add_history_many([entry])
+    
+    
+def add_history_many(entries: Iterable[WordEntry]) -> int:
+    """Add entries (newest first) to history, one write per ADD_BATCH of them.
+
+    entries is read a batch at a time, so an import of any size holds one
+    batch in memory. Entries already in history, or repeated in entries,
+    are skipped. Returns the number of entries added; nothing is written
+    if it is 0.
+    """
+    entries = (e for e in entries if not _is_placeholder(e))
+    total = 0
+    while True:
+        batch = list(itertools.islice(entries, ADD_BATCH))
+        if not batch:
+            return total
+        added = _repository().add_history_many(batch)
+        if added:
+            added.sort(key=_published_key, reverse=True)
+            if _search is not None:
+                _search.add_many((word_key(entry.word), entry) for entry in added)
+            if _fuzzy is not None:
+                _fuzzy.add_many((word_key(entry.word), entry.word) for entry in added)
+            _publish(HistoryInserted(tuple(added)))
+        total += len(added)
+    
+    
+def toggle_favorite(entry: WordEntry) -> bool:
+    is_fav = _repository().toggle_favorite(entry)
+    if is_fav and _fuzzy is not None:
+        _fuzzy.add_many([(word_key(entry.word), entry.word)])
+    _publish(FavoriteAdded(entry) if is_fav else FavoriteRemoved(entry))
+    return is_fav
+
+
+def add_favorites_many(entries: Iterable[WordEntry]) -> int:
+    """Add a batch of entries to favorites with a single write, the first on top.
+
+    Unlike toggle_favorite, words that are already favorites are left
+    alone. Returns the number of entries added. Unlike add_history_many the
+    batch is not split: the first entry can only go on top once the last
+    one is known.
+    """
+    added = _repository().add_favorites_many(e for e in entries if not _is_placeholder(e))
+    if added and _fuzzy is not None:
+        _fuzzy.add_many((word_key(entry.word), entry.word) for entry in added)
+    # Oldest first, so each event's "added to the top" leaves the first entry on top
+    for entry in reversed(added):
+        _publish(FavoriteAdded(entry))
+    return len(added)
+
 
 def get_history() -> List[WordEntry]:
-    return [_dict_to_entry(d) for d in load_data().get("history", [])]
+    """Return history, newest published first."""
+    return _repository().get_history()
+
+
+def iter_history() -> Iterator[WordEntry]:
+    """Yield history, newest published first, without building a list of it."""
+    return _repository().iter_history()
+
+
+def get_history_between(start: int, end: int) -> List[WordEntry]:
+    """Return the history entries published from start up to, not including, end.
+
+    Both bounds are Unix times; results are newest first. Entries whose
+    date could not be parsed have published_at 0.
+    """
+    return _repository().get_history_between(start, end)
+
+
+def search_history(query: str, limit: Optional[int] = None) -> List[WordEntry]:
+    """Full-text search over history, best match first.
+
+    Matches word, definitions, usage, examples and "Did you know?" text.
+    Every term must match; the last one also matches as a prefix.
+    """
+    keys = _search_index().search(query, limit)
+    return _repository().get_history_by_keys(keys)
+
+
+def fuzzy_lookup(word: str, k: int = 5) -> List[str]:
+    """Return up to k history or favorite words closest to word by edit distance.
+
+    Meant for "did you mean" suggestions; words are never dropped from the
+    index, so a removed favorite can still be suggested until restart.
+    """
+    return _fuzzy_index().lookup(word_key(word), k)
 
 
 def get_favorites() -> List[WordEntry]:
-    return [_dict_to_entry(d) for d in load_data().get("favorites", [])]
+    return _repository().get_favorites()
+
+
+def iter_favorites() -> Iterator[WordEntry]:
+    """Yield favorites, the top one first, without building a list of them."""
+    return _repository().iter_favorites()
 
 
 def is_favorite(word: str) -> bool:
     """Check if a word is in the favorites list."""
-    favorites = load_data().get("favorites", [])
-    return any(f.get("word") == word for f in favorites)
\ No newline at end of file
+    return _repository().is_favorite(word)
@@ -1,7 +1,7 @@
-from tabs.home_tab import build_home_tab, on_home_scroll, load_home
+from tabs.home_tab import build_home_tab, on_home_scroll, load_home, on_history_inserted
 from tabs.history_tab import build_history_tab, on_history_scroll, on_history_select, load_history
-from tabs.favorites_tab import build_favorites_tab, on_favorites_scroll, on_favorites_select, load_favorites, remove_selected_favorite
-from tabs.flashcards_tab import build_flashcards_tab, load_flashcards, start_flashcards, flip_flashcard, next_flashcard, show_flashcard
+from tabs.favorites_tab import build_favorites_tab, on_favorites_scroll, on_favorites_select, load_favorites, remove_selected_favorite, on_favorite_added, on_favorite_removed
+from tabs.flashcards_tab import build_flashcards_tab, load_flashcards, start_flashcards, flip_flashcard, grade_flashcard, next_flashcard, show_flashcard
 
 __all__ = [
     "build_home_tab",
@@ -11,15 +11,19 @@ __all__ = [
     "on_history_select",
     "load_history",
     "load_home",
+    "on_history_inserted",
     "build_favorites_tab",
     "on_favorites_scroll",
     "on_favorites_select",
     "load_favorites",
     "remove_selected_favorite",
+    "on_favorite_added",
+    "on_favorite_removed",
     "build_flashcards_tab",
     "load_flashcards",
     "start_flashcards",
     "flip_flashcard",
+    "grade_flashcard",
     "next_flashcard",
     "show_flashcard",
 ]
\ No newline at end of file
@@ -6,7 +6,9 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from main import App
     
-from storage import get_favorites, toggle_favorite
+import perf
+from storage import FavoriteAdded, FavoriteRemoved, get_favorites, toggle_favorite, word_key
+from tabs.list_fill import delete_row, fill_listbox, insert_rows
 from config import SURFACE, CARD, ON_SURFACE, PRIMARY, ON_PRIMARY, FONT_FAMILY, BORDER
 
 
@@ -113,16 +115,39 @@ def on_favorites_scroll(app: App, event: tk.Event) -> None:
     app.favorites_canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
 
 
+@perf.timed("ui.load_favorites")
 def load_favorites(app: App) -> None:
     """Load favorites data into the listbox."""
     app.favorites_data = get_favorites()
-    app.favorites_listbox.delete(0, tk.END)
-    for entry in app.favorites_data:
-        app.favorites_listbox.insert(tk.END, entry.word)
+    fill_listbox(app.favorites_listbox, [entry.word for entry in app.favorites_data])
     if not app.favorites_data:
         app.favorites_detail_var.set("No favorites yet.")
 
 
+def on_favorite_added(app: App, event: FavoriteAdded) -> bool:
+    """Put a new favorite at the top; returns False if a reload is needed."""
+    if not insert_rows(app.favorites_listbox, 0, [event.entry.word]):
+        return False
+    app.favorites_data.insert(0, event.entry)
+    return True
+
+
+def on_favorite_removed(app: App, event: FavoriteRemoved) -> bool:
+    """Drop a removed favorite's row; returns False if a reload is needed."""
+    key = word_key(event.entry.word)
+    for index, entry in enumerate(app.favorites_data):
+        if word_key(entry.word) == key:
+            break
+    else:
+        return True
+    if not delete_row(app.favorites_listbox, index):
+        return False
+    del app.favorites_data[index]
+    if not app.favorites_data:
+        app.favorites_detail_var.set("No favorites yet.")
+    return True
+
+
 def on_favorites_select(app: App, event: tk.Event) -> None:
     """Handle selection of a word in favorites listbox."""
     if not app.favorites_listbox.curselection():
@@ -159,8 +184,8 @@ def remove_selected_favorite(app: App) -> None:
         return
     index = app.favorites_listbox.curselection()[0]
     entry = app.favorites_data[index]
+    # The row is removed by the FavoriteRemoved event
     toggle_favorite(entry)
-    load_favorites(app)
     
     app.fav_word_var.set("")
     app.fav_meta_var.set("")
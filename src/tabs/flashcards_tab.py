@@ -1,13 +1,17 @@
 from __future__ import annotations
 
-import random
+import time
 import tkinter as tk
+from datetime import datetime
 from tkinter import ttk
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from main import App
 
+import perf
+from review_scheduler import GRADE_AGAIN, GRADE_EASY, GRADE_GOOD, GRADE_HARD, get_scheduler
+from storage import get_history, word_key
 from config import SURFACE
 
 
@@ -27,56 +31,76 @@ def build_flashcards_tab(app: App) -> None:
     
     controls = ttk.Frame(app.flashcard_canvas, style="Card.TFrame")
     controls.pack(side="bottom", fill="x", padx=10, pady=10)
-    shuffke_btn = ttk.Button(controls, text="Shuffle", style="Primary.TButton", command=lambda: start_flashcards(app))
-    shuffke_btn.pack(side="left", fill="x", padx=10, pady=10)
+    grades = ttk.Frame(controls, style="Card.TFrame")
+    grades.pack(side="bottom", fill="x")
+    for text, grade in (("Again", GRADE_AGAIN), ("Hard", GRADE_HARD), ("Good", GRADE_GOOD), ("Easy", GRADE_EASY)):
+        grade_btn = ttk.Button(grades, text=text, style="Secondary.TButton", command=lambda g=grade: grade_flashcard(app, g))
+        grade_btn.pack(side="left", fill="x", expand=True, padx=4, pady=(0, 10))
+    review_btn = ttk.Button(controls, text="Review", style="Primary.TButton", command=lambda: start_flashcards(app))
+    review_btn.pack(side="left", fill="x", padx=10, pady=10)
     flip_btn = ttk.Button(controls, text="Flip", style="Secondary.TButton", command=lambda: flip_flashcard(app))
     flip_btn.pack(side="left", fill="x", padx=10, pady=10)
-    next_btn = ttk.Button(controls, text="Next", style="Secondary.TButton", command=lambda: next_flashcard(app))
-    next_btn.pack(side="left", fill="x", padx=10, pady=10)
 
 
+@perf.timed("ui.load_flashcards")
 def load_flashcards(app: App) -> None:
-    """Load flashcards from history data."""
-    app.flashcards = list(app.history_data)
-    if not app.flashcards:
+    """Sync the review deck with history."""
+    history = get_history()
+    app.flashcard_entries = {word_key(entry.word): entry for entry in history}
+    scheduler = get_scheduler()
+    scheduler.sync(app.flashcard_entries)
+    if app.flashcard_key not in app.flashcard_entries:
+        app.flashcard_key = None
+    if not history:
         app.flashcard_title_var.set("No cards yet")
         app.flashcard_body_var.set("Add words to history to start.")
-        app.flashcard_index = 0
         app.flashcard_flipped = False
+    elif app.flashcard_key is None:
+        app.flashcard_title_var.set(f"{scheduler.due_count()} of {len(history)} cards due")
+        app.flashcard_body_var.set("Click Review to start.")
 
 
 def start_flashcards(app: App) -> None:
-    """Start a new flashcard session with shuffled cards."""
-    app.flashcards = list(app.history_data)
-    if not app.flashcards:
-        app.flashcard_title_var.set("No cards yet")
-        app.flashcard_body_var.set("Add words to history to start.")
-        return
-    random.shuffle(app.flashcards)
-    app.flashcard_index = 0
-    app.flashcard_flipped = False
-    show_flashcard(app)
+    """Start reviewing with the card that is due soonest."""
+    next_flashcard(app)
 
 
 def flip_flashcard(app: App) -> None:
     """Flip the current flashcard to show/hide definition."""
-    if not app.flashcards:
+    if app.flashcard_key is None:
         return
     app.flashcard_flipped = not app.flashcard_flipped
     show_flashcard(app)
 
 
-def next_flashcard(app: App) -> None:
-    """Move to the next flashcard."""
-    if not app.flashcards:
+def grade_flashcard(app: App, grade: int) -> None:
+    """Record how well the current card was recalled and move on."""
+    if app.flashcard_key is None:
         return
-    app.flashcard_index = (app.flashcard_index + 1) % len(app.flashcards)
+    get_scheduler().grade(app.flashcard_key, grade)
+    next_flashcard(app)
+
+
+def next_flashcard(app: App) -> None:
+    """Show the card due soonest, or when the next review is if none is due."""
+    key, due = get_scheduler().next_card()
     app.flashcard_flipped = False
+    if key is None:
+        app.flashcard_key = None
+        app.flashcard_title_var.set("No cards yet")
+        app.flashcard_body_var.set("Add words to history to start.")
+        return
+    if due > time.time():
+        app.flashcard_key = None
+        app.flashcard_title_var.set("All caught up")
+        app.flashcard_body_var.set(f"Next review: {datetime.fromtimestamp(due):%d %b %Y %H:%M}")
+        return
+    app.flashcard_key = key
     show_flashcard(app)
 
 
 def show_flashcard(app: App) -> None:
     """Display the current flashcard."""
-    entry = app.flashcards[app.flashcard_index]
+    entry = app.flashcard_entries[app.flashcard_key]
     app.flashcard_title_var.set(entry.word)
     app.flashcard_body_var.set(entry.definition if app.flashcard_flipped else "(Click Flip to reveal definition)")
@@ -6,7 +6,10 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from main import App
     
+import perf
 from storage import get_history, is_favorite
+from word_entry import published_date
+from tabs.list_fill import fill_listbox
 from config import SURFACE, CARD, ON_SURFACE, PRIMARY, ON_PRIMARY, FONT_FAMILY, BORDER
 
 def build_history_tab(app: App):
@@ -104,12 +107,11 @@ def on_history_scroll(app: App, event: tk.Event) -> None:
     app.history_canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
     
     
+@perf.timed("ui.load_history")
 def load_history(app: App) -> None:
     """Load history data into the listbox."""
     app.history_data = get_history()
-    app.history_listbox.delete(0, tk.END)
-    for entry in app.history_data:
-        app.history_listbox.insert(tk.END, entry.word)
+    fill_listbox(app.history_listbox, [entry.word for entry in app.history_data])
     if not app.history_data:
         app.history_detail_var.set("No history yet.")
 
@@ -129,12 +131,7 @@ def on_history_select(app: App, event: tk.Event) -> None:
 
     app.hist_word_var.set(entry.word)
     app.hist_meta_var.set(f"{entry.pronunciation}  •  {entry.part_of_speech}" if entry.pronunciation else entry.part_of_speech)
-    # Extract date only from published (e.g., "Mon, 20 Jan 2025 00:00:00 -0500" -> "20 Jan 2025")
-    date_only = entry.published
-    if entry.published:
-        parts = entry.published.split()
-        if len(parts) >= 4:
-            date_only = f"{parts[1]} {parts[2]} {parts[3]}"
+    date_only = published_date(entry)
     app.hist_published_var.set(f"Published: {date_only}" if date_only else "")
     app.hist_short_def_var.set(entry.short_definition)
     app.hist_def_var.set(entry.definition)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import bisect
 import tkinter as tk
 from tkinter import ttk
 
@@ -7,9 +8,16 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from main import App
 
-from storage import get_history, is_favorite
+import perf
+from storage import HistoryInserted, fuzzy_index_ready, fuzzy_lookup, get_history, is_favorite, search_history, search_index_ready
+from word_entry import published_date
+from tabs.list_fill import fill_listbox, insert_rows
 from config import SURFACE, CARD, ON_SURFACE, PRIMARY, ON_PRIMARY, FONT_FAMILY, BORDER
 
+# Pause in typing before the history filter runs, and most matches listed
+SEARCH_DELAY_MS = 120
+SEARCH_LIMIT = 500
+
 def build_home_tab(app: App) -> None:
     """Build the home tab UI."""
     
@@ -24,6 +32,26 @@ def build_home_tab(app: App) -> None:
     app.history_header.pack(side="left", fill="x", padx=(4,0))
     app.history_refresh_btn = ttk.Button(app.list_frame_header, text="↻", style="Icon.TButton", command=lambda: app.refresh(), width=2)
     app.history_refresh_btn.pack(side="right", fill="x", padx=(0,4))
+
+    # Why the last refresh failed, if it did
+    app.fetch_status_label = ttk.Label(list_frame, textvariable=app.fetch_status_var, style="Meta.TLabel", wraplength=140)
+    app.fetch_status_label.pack(side="top", fill="x", padx=(4,4))
+
+    # Search box, filters the listbox as you type
+    app.search_entry = tk.Entry(
+        master=list_frame, textvariable=app.search_var, width=20, bg=CARD, fg=ON_SURFACE,
+        insertbackground=ON_SURFACE, font=(FONT_FAMILY, 9), relief="flat", highlightthickness=1,
+        highlightcolor=PRIMARY, highlightbackground=BORDER
+    )
+    app.search_entry.pack(side="top", fill="x", pady=(4,4))
+    app.search_after_id = None
+    app.search_var.trace_add("write", lambda *args: on_search_changed(app))
+    app.search_entry.bind("<Escape>", lambda e: app.search_var.set(""))
+
+    # "Did you mean" hint, shown when a search finds nothing
+    app.suggestion = None
+    app.suggestion_label = ttk.Label(list_frame, textvariable=app.suggestion_var, style="Meta.TLabel", cursor="hand2")
+    app.suggestion_label.bind("<Button-1>", lambda e: apply_suggestion(app))
     
     # listbox
     app.history_listbox = tk.Listbox(
@@ -112,17 +140,87 @@ def on_home_scroll(app: App, event: tk.Event) -> None:
     """Handle mouse wheel scroll on home tab."""
     app.home_canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
     
+@perf.timed("ui.load_home")
 def load_home(app: App) -> None:
-    """Load history data into the listbox."""
-    app.history_data = get_history()
-    app.history_listbox.delete(0, tk.END)
-    if app.history_data:
-        for entry in app.history_data:
-            app.history_listbox.insert(tk.END, entry.word)
-        app.history_listbox.selection_set(0)
-        app.history_listbox.see(0)
+    """Load history data, or the matches for the search box, into the listbox."""
+    query = app.search_var.get().strip()
+    if query and not search_index_ready():
+        # Still loading on the indexing thread; look again shortly rather than wait here
+        app.suggestion = None
+        show_hint(app, "Indexing history…")
+        if app.search_after_id is None:
+            app.search_after_id = app.after(SEARCH_DELAY_MS, lambda: _run_search(app))
+        return
+    app.history_data = search_history(query, SEARCH_LIMIT) if query else get_history()
+    # No suggestion until the fuzzy index is ready; building it here would stall typing
+    suggestions = fuzzy_lookup(query, 1) if query and not app.history_data and fuzzy_index_ready() else []
+    show_suggestion(app, suggestions[0] if suggestions else None)
+    fill_listbox(app.history_listbox, [entry.word for entry in app.history_data], lambda: _select_first(app))
+
+
+def _select_first(app: App) -> None:
+    app.history_listbox.selection_set(0)
+    app.history_listbox.see(0)
+
+
+def on_history_inserted(app: App, event: HistoryInserted) -> bool:
+    """Insert newly stored words into the listbox and history_data by date.
+
+    Words newer than everything listed (the usual case) go in as one block
+    at the top; older ones, e.g. from a backfill, are placed by bisection.
+    Returns False if the list is mid-load or filtered by a search and has
+    to be reloaded instead.
+    """
+    if app.search_var.get().strip():
+        return False
+    entries = event.entries
+    if not app.history_data or entries[-1].published_at >= app.history_data[0].published_at:
+        if not insert_rows(app.history_listbox, 0, [entry.word for entry in entries]):
+            return False
+        app.history_data[0:0] = entries
+        return True
+    for entry in entries:
+        # history_data is newest first; bisect_left puts the word above equal dates, as storage does
+        index = bisect.bisect_left(app.history_data, -entry.published_at, key=lambda e: -e.published_at)
+        if not insert_rows(app.history_listbox, index, [entry.word]):
+            return False
+        app.history_data.insert(index, entry)
+    return True
     
     
+def on_search_changed(app: App) -> None:
+    """Rerun the history filter once typing pauses."""
+    if app.search_after_id is not None:
+        app.after_cancel(app.search_after_id)
+    app.search_after_id = app.after(SEARCH_DELAY_MS, lambda: _run_search(app))
+
+
+def _run_search(app: App) -> None:
+    app.search_after_id = None
+    load_home(app)
+
+
+def show_suggestion(app: App, word: str | None) -> None:
+    """Show or hide the "did you mean" hint under the search box."""
+    app.suggestion = word
+    if word is None:
+        app.suggestion_label.pack_forget()
+        return
+    show_hint(app, f"Did you mean {word}?")
+
+
+def show_hint(app: App, text: str) -> None:
+    """Show text in the hint line under the search box."""
+    app.suggestion_var.set(text)
+    app.suggestion_label.pack(side="top", fill="x", after=app.search_entry)
+
+
+def apply_suggestion(app: App) -> None:
+    """Search for the suggested word instead."""
+    if app.suggestion:
+        app.search_var.set(app.suggestion)
+
+
 def on_home_select(app: App, event: tk.Event) -> None:
     """Handle selection of a word in history listbox."""
     if not app.history_listbox.curselection():
@@ -135,12 +233,7 @@ def on_home_select(app: App, event: tk.Event) -> None:
     # Update UI vars to show selected word
     app.word_var.set(entry.word)
     app.meta_var.set(f"{entry.pronunciation}  •  {entry.part_of_speech}" if entry.pronunciation else entry.part_of_speech)
-    # Extract date only from published (e.g., "Mon, 20 Jan 2025 00:00:00 -0500" -> "20 Jan 2025")
-    date_only = entry.published
-    if entry.published:
-        parts = entry.published.split()
-        if len(parts) >= 4:
-            date_only = f"{parts[1]} {parts[2]} {parts[3]}"
+    date_only = published_date(entry)
     app.published_var.set(f"Published: {date_only}" if date_only else "")
     app.short_def_var.set(entry.short_definition)
     app.definition_var.set(entry.definition)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import time
+import tkinter as tk
+from typing import Callable, Dict, List, Optional, Sequence
+
+# Rows inserted per Tk call, and the time one after() slice may spend inserting
+FILL_CHUNK_ROWS = 500
+FILL_SLICE_MS = 8
+
+# listbox path -> words currently shown, and the pending fill callback id
+_shown: Dict[str, List[str]] = {}
+_pending: Dict[str, str] = {}
+
+
+def fill_listbox(listbox: tk.Listbox, words: Sequence[str], on_first_chunk: Optional[Callable[[], None]] = None) -> bool:
+    """Replace the rows of listbox with words without blocking the event loop.
+
+    The first chunk is inserted right away so the visible rows appear at
+    once; the rest is appended from after() callbacks, each limited to
+    FILL_SLICE_MS. Row i is always words[i], so selection indexes map
+    straight onto the caller's data list. A new fill cancels the one still
+    running on the same listbox. Returns False if the listbox already shows
+    exactly these words and nothing was done.
+    """
+    key = str(listbox)
+    words = list(words)
+    if key not in _pending and _shown.get(key) == words:
+        return False
+    cancel_fill(listbox)
+    listbox.delete(0, tk.END)
+    _shown[key] = words
+    listbox.insert(tk.END, *words[:FILL_CHUNK_ROWS])
+    if on_first_chunk is not None and words:
+        on_first_chunk()
+    if len(words) > FILL_CHUNK_ROWS:
+        _pending[key] = listbox.after_idle(_fill_step, listbox, words, FILL_CHUNK_ROWS)
+    return True
+
+
+def cancel_fill(listbox: tk.Listbox) -> None:
+    """Stop a fill in progress; rows inserted so far are kept."""
+    after_id = _pending.pop(str(listbox), None)
+    if after_id is not None:
+        listbox.after_cancel(after_id)
+        # Partially filled, so the next fill must not be skipped
+        _shown.pop(str(listbox), None)
+
+
+def _fill_step(listbox: tk.Listbox, words: List[str], start: int) -> None:
+    key = str(listbox)
+    _pending.pop(key, None)
+    if not listbox.winfo_exists():
+        _shown.pop(key, None)
+        return
+    deadline = time.perf_counter() + FILL_SLICE_MS / 1000
+    while start < len(words):
+        listbox.insert(tk.END, *words[start:start + FILL_CHUNK_ROWS])
+        start += FILL_CHUNK_ROWS
+        if time.perf_counter() >= deadline:
+            break
+    if start < len(words):
+        # Yield to pending events before the next slice
+        _pending[key] = listbox.after(1, _fill_step, listbox, words, start)
+
+
+def insert_rows(listbox: tk.Listbox, index: int, words: Sequence[str]) -> bool:
+    """Insert words at index as one listbox call.
+
+    Returns False, changing nothing, while a fill is still running; the
+    caller should reload the list instead.
+    """
+    key = str(listbox)
+    if key in _pending or key not in _shown:
+        return False
+    listbox.insert(index, *words)
+    _shown[key][index:index] = words
+    return True
+
+
+def delete_row(listbox: tk.Listbox, index: int) -> bool:
+    """Delete the row at index; returns False while a fill is still running."""
+    key = str(listbox)
+    if key in _pending or key not in _shown:
+        return False
+    listbox.delete(index)
+    del _shown[key][index]
+    return True
@@ -0,0 +1,252 @@
+"""Headless command line interface: python -m verba <command>.
+
+Built on rss_client and storage only; it never imports tkinter or config,
+so it runs on servers and in scheduled jobs.
+"""
+import time
+
+# Taken before the remaining imports so --timing covers them
+_PROCESS_START = time.perf_counter()
+
+import argparse
+import sys
+from datetime import date, datetime, timezone
+from typing import List, Optional, Tuple
+
+import perf
+import storage
+from word_entry import WordEntry, published_date
+
+# Default seconds between polls in daemon mode
+DAEMON_INTERVAL = 3600
+
+
+def _utc_day(day: date) -> int:
+    # Feed dates are compared as UTC days. The feeds publish at midnight or
+    # just after in zones at or behind UTC, so that is the day published_date shows.
+    return int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp())
+
+
+def _date_range(args: argparse.Namespace) -> Optional[Tuple[int, int]]:
+    """[start, end) Unix time range selected by --since, --until and --days, or None without them."""
+    if args.since is None and args.until is None and args.days is None:
+        return None
+    end = _utc_day(args.until) + 86400 if args.until else int(time.time()) + 1
+    if args.since:
+        start = _utc_day(args.since)
+    elif args.days is not None:
+        start = end - args.days * 86400
+    else:
+        start = 0
+    return start, end
+
+
+def _find_entry(word: str) -> Optional[WordEntry]:
+    key = storage.word_key(word)
+    for entry in storage.get_history() + storage.get_favorites():
+        if storage.word_key(entry.word) == key:
+            return entry
+    return None
+
+
+def _fetch(feed_url: Optional[str]) -> int:
+    # --feed-url replaces the registry in feeds.json with that one feed
+    # Only fetching needs the feed reader and its thread pool; keep other commands' start light
+    from feeds import Feed, fetch_feeds
+    entries = fetch_feeds([Feed(feed_url, feed_url)] if feed_url else None)
+    added = storage.add_history_many(entries)
+    storage.flush()
+    return added
+
+
+def cmd_fetch(args: argparse.Namespace) -> int:
+    added = _fetch(args.feed_url)
+    history = storage.get_history()
+    latest = history[0].word if history else "(no data)"
+    print(f"{added} new word(s); latest: {latest}")
+    return 0
+
+
+def cmd_list(args: argparse.Namespace) -> int:
+    dates = _date_range(args)
+    if args.search:
+        entries = storage.search_history(args.search, args.limit)
+    elif dates is not None:
+        entries = storage.get_history_between(*dates)[:args.limit]
+    else:
+        entries = storage.get_favorites() if args.favorites else storage.get_history()
+        entries = entries[:args.limit]
+    for entry in entries:
+        print(f"{published_date(entry):<12}  {entry.word}")
+    if args.search and not entries:
+        suggestions = storage.fuzzy_lookup(args.search, 3)
+        if suggestions:
+            print(f"No matches. Did you mean: {', '.join(suggestions)}?", file=sys.stderr)
+    return 0
+
+
+def cmd_favorite(args: argparse.Namespace) -> int:
+    entry = _find_entry(args.word)
+    if entry is None:
+        suggestions = storage.fuzzy_lookup(args.word, 3)
+        hint = f" Did you mean: {', '.join(suggestions)}?" if suggestions else ""
+        print(f"{args.word!r} is not in history.{hint}", file=sys.stderr)
+        return 1
+    is_fav = storage.is_favorite(entry.word)
+    # --add and --remove leave a word that is already in that state alone
+    if not (args.add and is_fav or args.remove and not is_fav):
+        is_fav = storage.toggle_favorite(entry)
+        storage.flush()
+    print(f"{entry.word}: {'favorite' if is_fav else 'not a favorite'}")
+    return 0
+
+
+def cmd_export(args: argparse.Namespace) -> int:
+    from interchange import guess_format, write_entries
+    fmt = args.format or guess_format(args.output)
+    # Streamed from storage; the whole list is never built
+    entries = storage.iter_favorites() if args.favorites else storage.iter_history()
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        count = write_entries(entries, out, fmt)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if args.output:
+        print(f"Exported {count} entries to {args.output} ({fmt})", file=sys.stderr)
+    return 0
+
+
+def cmd_import(args: argparse.Namespace) -> int:
+    from interchange import guess_format, read_entries
+    fmt = args.format or guess_format(args.input)
+    add = storage.add_favorites_many if args.favorites else storage.add_history_many
+    try:
+        with open(args.input, encoding="utf-8", newline="") as infile:
+            # Check every record before storing any, then read the file again
+            # and add its entries as they are read
+            for _ in read_entries(infile, fmt):
+                pass
+            infile.seek(0)
+            added = add(read_entries(infile, fmt))
+    except (OSError, ValueError) as exc:
+        print(f"Import failed: {exc}", file=sys.stderr)
+        return 1
+    storage.flush()
+    print(f"Imported {added} new {'favorite' if args.favorites else 'word'}(s) from {args.input}")
+    return 0
+
+
+def cmd_stats(args: argparse.Namespace) -> int:
+    history = storage.get_history()
+    favorites = storage.get_favorites()
+    print(f"backend:   {storage.STORAGE_BACKEND}")
+    print(f"history:   {len(history)}")
+    print(f"favorites: {len(favorites)}")
+    if history:
+        print(f"newest:    {history[0].word} ({published_date(history[0])})")
+        print(f"oldest:    {history[-1].word} ({published_date(history[-1])})")
+    from review_scheduler import get_scheduler
+    scheduler = get_scheduler()
+    scheduler.sync(storage.word_key(entry.word) for entry in history)
+    print(f"due cards: {scheduler.due_count()}")
+    return 0
+
+
+def cmd_daemon(args: argparse.Namespace) -> int:
+    """Poll the feeds every interval seconds until interrupted."""
+    print(f"Polling {args.feed_url or 'feeds'} every {args.interval}s; Ctrl+C to stop", flush=True)
+    try:
+        while True:
+            started = time.monotonic()
+            stamp = datetime.now().isoformat(timespec="seconds")
+            try:
+                added = _fetch(args.feed_url)
+                print(f"{stamp} {added} new word(s)", flush=True)
+            except Exception as exc:
+                # A bad poll must not end the daemon; try again next round
+                print(f"{stamp} fetch failed: {exc}", file=sys.stderr, flush=True)
+            if args.once:
+                return 0
+            time.sleep(max(0.0, args.interval - (time.monotonic() - started)))
+    except KeyboardInterrupt:
+        return 0
+
+
+def cmd_backfill(args: argparse.Namespace) -> int:
+    import backfill
+    backfill.main(args.backfill_args)
+    return 0
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="verba", description="Verba word of the day, without the window.")
+    parser.add_argument("--timing", action="store_true", help="print the command's wall time, from process start, to stderr")
+    parser.add_argument("--profile", action="store_true", help=f"run the command under cProfile; stats go to {perf.PROFILE_FILE} and stderr")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fetch = commands.add_parser("fetch", help="fetch the feeds into history")
+    fetch.add_argument("--feed-url", help="fetch this Merriam-Webster style feed instead of the feeds in feeds.json")
+    fetch.set_defaults(func=cmd_fetch)
+
+    list_ = commands.add_parser("list", help="list history, favorites or search results")
+    list_.add_argument("--favorites", action="store_true", help="list favorites instead of history")
+    list_.add_argument("--search", metavar="QUERY", help="full-text search over history")
+    list_.add_argument("--limit", type=int, default=None, help="show at most this many words")
+    dates = list_.add_mutually_exclusive_group()
+    dates.add_argument("--since", type=date.fromisoformat, metavar="YYYY-MM-DD", help="only words published on or after this day")
+    dates.add_argument("--days", type=int, metavar="N", help="only words published in the last N days")
+    list_.add_argument("--until", type=date.fromisoformat, metavar="YYYY-MM-DD", help="only words published on or before this day")
+    list_.set_defaults(func=cmd_list)
+
+    favorite = commands.add_parser("favorite", help="toggle a word's favorite status")
+    favorite.add_argument("word")
+    mode = favorite.add_mutually_exclusive_group()
+    mode.add_argument("--add", action="store_true", help="only add, never remove")
+    mode.add_argument("--remove", action="store_true", help="only remove, never add")
+    favorite.set_defaults(func=cmd_favorite)
+
+    export = commands.add_parser("export", help="write entries as JSON lines, CSV or an Anki import file")
+    export.add_argument("--favorites", action="store_true", help="export favorites instead of history")
+    export.add_argument("--format", choices=("jsonl", "csv", "anki"), help="output format (default: by extension, .csv or .txt for anki; else jsonl)")
+    export.add_argument("-o", "--output", metavar="FILE", help="output file (default: stdout)")
+    export.set_defaults(func=cmd_export)
+
+    import_ = commands.add_parser("import", help="merge a JSON lines or CSV export into history")
+    import_.add_argument("input", metavar="FILE")
+    import_.add_argument("--favorites", action="store_true", help="import into favorites instead of history")
+    import_.add_argument("--format", choices=("jsonl", "csv"), help="input format (default: csv for .csv files, else jsonl)")
+    import_.set_defaults(func=cmd_import)
+
+    stats = commands.add_parser("stats", help="show collection statistics")
+    stats.set_defaults(func=cmd_stats)
+
+    daemon = commands.add_parser("daemon", help="poll the feeds on a schedule")
+    daemon.add_argument("--interval", type=float, default=DAEMON_INTERVAL, help=f"seconds between polls (default: {DAEMON_INTERVAL})")
+    daemon.add_argument("--feed-url", help="poll this Merriam-Webster style feed instead of the feeds in feeds.json")
+    daemon.add_argument("--once", action="store_true", help="poll once and exit, for cron-style scheduling")
+    daemon.set_defaults(func=cmd_daemon)
+
+    # Its arguments are left unparsed here and handed to backfill.main (see main);
+    # declaring them would mean importing backfill on every command
+    backfill = commands.add_parser("backfill", help="backfill history from the archive (see backfill --help)", add_help=False)
+    backfill.set_defaults(func=cmd_backfill)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = _build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if args.command == "backfill":
+        args.backfill_args = extra
+    elif extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    with perf.profiled(perf.PROFILE_FILE if args.profile else None):
+        status = args.func(args)
+    if args.timing:
+        print(f"{args.command}: {(time.perf_counter() - _PROCESS_START) * 1000:.1f} ms", file=sys.stderr)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
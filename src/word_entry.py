@@ -0,0 +1,49 @@
+"""The word entry record and its date helpers.
+
+Kept apart from rss_client so storage, the tabs and the CLI can use
+entries without loading the feed reader and its compiled patterns at
+startup.
+"""
+from dataclasses import dataclass
+
+
+# Slots drop the per-instance __dict__; history can hold 100k of these
+@dataclass(frozen=True, slots=True)
+class WordEntry:
+    word: str
+    pronunciation: str
+    part_of_speech: str
+    definition: str
+    short_definition: str
+    usage_example: str
+    examples: str
+    did_you_know: str
+    published: str
+    link: str
+    # Unix time of published, parsed once when the entry is created; 0 if unknown
+    published_at: int = 0
+
+    def __post_init__(self) -> None:
+        # Entries read back from storage carry it already
+        if not self.published_at and self.published:
+            object.__setattr__(self, "published_at", published_epoch(self.published))
+
+
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+def published_epoch(published: str) -> int:
+    """Unix time of an RFC 822 date ("Mon, 20 Jan 2025 00:00:00 -0500"), or 0 if it does not parse."""
+    from email.utils import mktime_tz, parsedate_tz
+    parsed = parsedate_tz(published)
+    return mktime_tz(parsed) if parsed else 0
+
+def published_date(entry: WordEntry) -> str:
+    """Publication date for display, e.g. "20 Jan 2025", or the raw text if it has no date.
+
+    The date is the one the pubDate gives, in its own time zone.
+    """
+    from email.utils import parsedate_tz
+    parsed = parsedate_tz(entry.published)
+    if not parsed:
+        return entry.published
+    return f"{parsed[2]:02d} {_MONTHS[parsed[1] - 1]} {parsed[0]}"
@@ -0,0 +1,121 @@
+import http.server
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pytest
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+DATA_SAMPLES = Path(__file__).resolve().parent / "data"
+
+sys.path.insert(0, str(SRC_DIR))
+# Modules resolve their data files at import; keep every test away from data/
+_DATA_DIR = tempfile.mkdtemp(prefix="verba-tests-")
+os.environ["VERBA_DATA_DIR"] = _DATA_DIR
+os.environ.pop("VERBA_STORAGE", None)
+os.environ.pop("VERBA_PERF", None)
+# The stand-in servers are local; a proxy from the environment would get in the way
+for _name in ("http_proxy", "https_proxy", "all_proxy", "no_proxy"):
+    os.environ.pop(_name, None)
+    os.environ.pop(_name.upper(), None)
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    shutil.rmtree(_DATA_DIR, ignore_errors=True)
+
+
+class StandInServer:
+    """A local HTTP server standing in for a feed or archive host.
+
+    Serves the bodies registered with add(), answers a matching
+    If-None-Match with 304, and records the path, validator and status of
+    every request.
+    """
+
+    def __init__(self) -> None:
+        self.routes: Dict[str, Tuple[int, bytes, Optional[str]]] = {}
+        self.requests: List[Tuple[str, Optional[str], int]] = []
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                status, body, etag = server.routes.get(self.path, (404, b"", None))
+                validator = self.headers.get("If-None-Match")
+                if etag is not None and validator == etag:
+                    status, body = 304, b""
+                server.requests.append((self.path, validator, status))
+                self.send_response(status)
+                if etag is not None:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        self._httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        threading.Thread(target=self._httpd.serve_forever, args=(0.05,), daemon=True).start()
+
+    def add(self, path: str, body: bytes, etag: Optional[str] = None, status: int = 200) -> str:
+        """Serve body at path; returns its URL."""
+        self.routes[path] = (status, body, etag)
+        return self.url(path)
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.port}{path}"
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def stand_in() -> Iterator[StandInServer]:
+    server = StandInServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def closed_url() -> str:
+    """URL of a local port nothing listens on, so requests to it fail at once."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/feed"
+
+
+@pytest.fixture
+def feed_sample() -> bytes:
+    """A saved Merriam-Webster word-of-the-day feed, newest item first."""
+    return (DATA_SAMPLES / "wotd_feed.xml").read_bytes()
+
+
+@pytest.fixture
+def data_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    """Point the feed cache and storage at an empty directory for one test."""
+    import rss_client
+    import storage
+    monkeypatch.setattr(rss_client, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(rss_client, "FEED_CACHE_FILE", tmp_path / "feed_cache.json")
+    monkeypatch.setattr(rss_client, "FEED_BODY_FILE", tmp_path / "feed_cache.xml")
+    monkeypatch.setattr(storage, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(storage, "DATA_FILE", tmp_path / "wotd.json")
+    monkeypatch.setattr(storage, "SEARCH_INDEX_FILE", tmp_path / "search_index.json")
+    monkeypatch.setattr(storage, "_repo", None)
+    monkeypatch.setattr(storage, "_search", None)
+    monkeypatch.setattr(storage, "_search_saved", 0)
+    monkeypatch.setattr(storage, "_fuzzy", None)
+    yield tmp_path
+    # A pending debounced flush would otherwise fire into the next test's directory
+    storage.flush()
@@ -0,0 +1,74 @@
+import json
+from datetime import date
+
+import pytest
+
+import backfill
+import storage
+
+PAGE = """<!doctype html><html><head>
+<link rel="canonical" href="https://www.merriam-webster.com/word-of-the-day/{word}-{day}"><meta charset="utf-8"></head>
+<body><div class="word-and-pronunciation"><h2 class="word-header-txt">{word}</h2></div>
+<div class="word-attributes"><span class="main-attr">noun</span><span class="word-syllables">{word}-syl</span></div>
+<div class="wod-definition-container"><h2>What It Means</h2><p><em>{word}</em> means something &amp; more.</p>
+<p>// She showed <em>{word}</em> daily.</p><p><a href="/x">See the entry &gt;</a></p>
+<h2>{word} in Context</h2><p>Example one.</p><p>Example two.</p><br></div>
+<div class="did-you-know-wrapper"><h2>Did You Know?</h2><p>History of {word}.</p><p>More history.</p></div>
+</body></html>"""
+
+
+def _serve_days(stand_in, first: int, last: int) -> None:
+    for n in range(first, last + 1):
+        day = f"2026-01-{n:02d}"
+        stand_in.add(f"/wotd/{day}", PAGE.format(word=f"word{n}", day=day).encode("utf-8"))
+
+
+@pytest.fixture
+def archive(data_dir, stand_in, monkeypatch):
+    # One attempt per run, so a failing page does not wait out the backoff
+    monkeypatch.setattr(backfill, "BACKFILL_ATTEMPTS", 1)
+    return stand_in
+
+
+def _run(archive, data_dir, start: int, end: int):
+    return backfill.backfill(
+        date(2026, 1, start), date(2026, 1, end),
+        workers=2, rate=0, base_url=archive.url("/wotd/{date}"), checkpoint=data_dir / "checkpoint.json",
+    )
+
+
+def test_backfill_stores_pages_and_resumes(archive, data_dir):
+    _serve_days(archive, 1, 6)
+    archive.add("/wotd/2026-01-04", b"", status=404)
+    archive.add("/wotd/2026-01-05", b"", status=503)
+
+    stats = _run(archive, data_dir, 1, 6)
+    assert stats == {"fetched": 5, "added": 4, "missing": 1, "failed": 1, "skipped": 0}
+    history = storage.get_history()
+    assert [entry.word for entry in history] == ["word6", "word3", "word2", "word1"]
+    entry = history[-1]
+    assert entry.definition == "word1 means something & more."
+    assert entry.usage_example == "She showed word1 daily."
+    assert entry.examples == "Example one. Example two."
+    assert entry.did_you_know == "History of word1. More history."
+    assert entry.link.endswith("/word1-2026-01-01")
+    assert entry.published_at == 1767225600
+    done = json.loads((data_dir / "checkpoint.json").read_text(encoding="utf-8"))["done"]
+    assert "2026-01-05" not in done and "2026-01-04" in done
+
+    # The failed day is the only one fetched again
+    _serve_days(archive, 5, 5)
+    requests = len(archive.requests)
+    stats = _run(archive, data_dir, 1, 6)
+    assert stats == {"fetched": 1, "added": 1, "missing": 0, "failed": 0, "skipped": 5}
+    assert [path for path, _, _ in archive.requests[requests:]] == ["/wotd/2026-01-05"]
+    assert storage.get_history()[1].word == "word5"
+
+
+def test_reversed_range_is_rejected(archive, data_dir, capsys):
+    with pytest.raises(ValueError):
+        _run(archive, data_dir, 5, 1)
+    with pytest.raises(SystemExit):
+        backfill.main(["2026-01-05", "2026-01-01"])
+    assert "before start date" in capsys.readouterr().err
+    assert archive.requests == []
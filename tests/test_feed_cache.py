@@ -0,0 +1,50 @@
+import json
+
+import rss_client
+
+
+def test_conditional_get_reuses_cached_entries(data_dir, stand_in, feed_sample):
+    url = stand_in.add("/feed", feed_sample, etag='"v1"')
+
+    first = rss_client.fetch_latest_word(url)
+    assert first.word == "adulation"
+    assert stand_in.requests[-1] == ("/feed", None, 200)
+    cache = json.loads(rss_client._cache_files(url)[0].read_text(encoding="utf-8"))
+    assert cache["etag"] == '"v1"' and len(cache["entries"]) == 1
+
+    # Unchanged feed: the validator is sent and the cached entry comes back
+    assert rss_client.fetch_latest_word(url) == first
+    assert stand_in.requests[-1] == ("/feed", '"v1"', 304)
+
+    # Parsing stopped after one item; the rest comes from the cached body
+    entries = list(rss_client.fetch_all_words(url))
+    assert stand_in.requests[-1] == ("/feed", '"v1"', 304)
+    assert len(entries) == feed_sample.count(b"<item>")
+    assert entries[0] == first
+
+
+def test_changed_feed_is_downloaded_again(data_dir, stand_in, feed_sample):
+    url = stand_in.add("/feed", feed_sample, etag='"v1"')
+    rss_client.fetch_latest_word(url)
+    newer = feed_sample.replace(b"<title>adulation</title>", b"<title>newer</title>", 1)
+    stand_in.add("/feed", newer, etag='"v2"')
+    assert rss_client.fetch_latest_word(url).word == "newer"
+    assert stand_in.requests[-1] == ("/feed", '"v1"', 200)
+    assert rss_client.load_cached_word(url).word == "newer"
+
+
+def test_offline_falls_back_to_cache_then_no_data(data_dir, stand_in, feed_sample, closed_url):
+    url = stand_in.add("/feed", feed_sample, etag='"v1"')
+    cached = rss_client.fetch_latest_word(url)
+    stand_in.close()
+    assert rss_client.fetch_latest_word(url) == cached
+
+    missing = rss_client.fetch_latest_word(closed_url)
+    assert missing.word == "(no data)" and missing.link == closed_url
+
+
+def test_error_status_falls_back_to_cache(data_dir, stand_in, feed_sample):
+    url = stand_in.add("/feed", feed_sample, etag='"v1"')
+    cached = rss_client.fetch_latest_word(url)
+    stand_in.add("/feed", b"", status=503)
+    assert rss_client.fetch_latest_word(url) == cached
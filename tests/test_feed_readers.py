@@ -0,0 +1,28 @@
+"""The streaming reader against feedparser, which fetch_latest_word used before it."""
+import tracemalloc
+
+import pytest
+
+from rss_client import FEED_URL, _entry_from_item, parse_feed
+
+feedparser = pytest.importorskip("feedparser")
+
+
+def _peak_bytes(func) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_streaming_reader_matches_feedparser(feed_sample):
+    expected = [_entry_from_item(item, FEED_URL) for item in feedparser.parse(feed_sample).entries]
+    assert list(parse_feed(feed_sample)) == expected
+
+
+def test_latest_item_costs_less_memory_than_feedparser(feed_sample):
+    streaming = _peak_bytes(lambda: next(parse_feed(feed_sample)))
+    full = _peak_bytes(lambda: _entry_from_item(feedparser.parse(feed_sample).entries[0], FEED_URL))
+    assert streaming < full
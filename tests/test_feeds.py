@@ -0,0 +1,62 @@
+import pytest
+
+import feeds
+import rss_client
+from conftest import DATA_SAMPLES
+from http_pool import ConnectionPool
+
+
+@pytest.fixture
+def plain_sample() -> bytes:
+    return (DATA_SAMPLES / "plain_feed.xml").read_bytes()
+
+
+def test_parse_plain_rss(plain_sample):
+    entries = list(feeds.parse_plain_rss(plain_sample, "http://feed"))
+    assert [entry.word for entry in entries] == ["zephyr", "Zephyr", "Prescience", "quixotic"]
+    assert entries[0].definition == "a gentle breeze"
+    assert entries[0].link == "http://x/zephyr"
+    assert entries[0].published_at > entries[1].published_at
+
+
+def test_fetch_feeds_merges_and_tolerates_a_failing_feed(data_dir, stand_in, feed_sample, plain_sample, closed_url):
+    mw = feeds.Feed("M-W", stand_in.add("/mw", feed_sample))
+    plain = feeds.Feed("Plain", stand_in.add("/plain", plain_sample), "rss")
+    broken = feeds.Feed("Broken", closed_url, "rss")
+
+    merged = feeds.fetch_feeds([mw, plain, broken])
+    words = [entry.word.lower() for entry in merged]
+    assert len(words) == len(set(words))
+    assert {"zephyr", "quixotic", "adulation"} <= set(words)
+    # A word in both feeds comes from the first one listed
+    prescience = next(entry for entry in merged if entry.word.lower() == "prescience")
+    assert prescience.link.startswith("https://www.merriam-webster.com/")
+    # Within one feed the newest entry of a word wins
+    zephyr = next(entry for entry in merged if entry.word.lower() == "zephyr")
+    assert zephyr.link == "http://x/zephyr"
+    assert [entry.published_at for entry in merged] == sorted((e.published_at for e in merged), reverse=True)
+
+    # Unreachable feeds with nothing cached contribute no entries
+    assert feeds.fetch_feeds([broken, feeds.Feed("Also broken", closed_url)]) == []
+
+
+def test_requests_go_through_the_configured_proxy(data_dir, stand_in, feed_sample, monkeypatch):
+    # The stand-in plays the proxy: it is sent the absolute URL
+    stand_in.routes["http://feed.invalid/rss"] = (200, feed_sample, '"v1"')
+    monkeypatch.setenv("http_proxy", stand_in.url(""))
+    monkeypatch.setattr(rss_client, "_pool", None)
+
+    assert rss_client.fetch_latest_word("http://feed.invalid/rss").word == "adulation"
+    assert stand_in.requests[-1] == ("http://feed.invalid/rss", None, 200)
+    assert rss_client.fetch_latest_word("http://feed.invalid/rss").word == "adulation"
+    assert stand_in.requests[-1] == ("http://feed.invalid/rss", '"v1"', 304)
+
+
+def test_no_proxy_hosts_are_fetched_directly(stand_in, closed_url, monkeypatch):
+    url = stand_in.add("/direct", b"direct")
+    monkeypatch.setenv("http_proxy", closed_url)
+    monkeypatch.setenv("no_proxy", "127.0.0.1")
+
+    status, _, body = ConnectionPool(timeout=5).get(url, {})
+    assert (status, body) == (200, b"direct")
+    assert stand_in.requests[-1] == ("/direct", None, 200)
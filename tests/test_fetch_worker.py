@@ -0,0 +1,140 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from fetch_worker import FetchWorker
+
+
+def _wait_for_results(worker: FetchWorker, timeout: float = 5.0) -> list:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        results = worker.poll()
+        if results:
+            return results
+        time.sleep(0.005)
+    raise AssertionError("no result from the worker")
+
+
+def test_requests_during_a_fetch_are_coalesced():
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return ["word"]
+
+    worker = FetchWorker(fetch)
+    assert worker.request() is True
+    assert worker.request() is False
+    assert worker.busy
+    release.set()
+    assert _wait_for_results(worker) == [(["word"], None)]
+    assert not worker.busy and calls == [1]
+    assert worker.request() is True
+    assert _wait_for_results(worker) == [(["word"], None)]
+
+
+def test_errors_are_delivered():
+    error = OSError("offline")
+
+    def fetch():
+        raise error
+
+    worker = FetchWorker(fetch)
+    worker.request()
+    assert _wait_for_results(worker) == [(None, error)]
+
+
+def test_cancelled_fetch_result_is_dropped():
+    release = threading.Event()
+    worker = FetchWorker(lambda: release.wait(5) and "late")
+    worker.request()
+    worker.cancel()
+    assert not worker.busy
+    release.set()
+    time.sleep(0.05)
+    assert worker.poll() == []
+
+
+def test_ui_thread_never_waits_on_the_fetch():
+    # What the Tk thread spends per refresh: starting the fetch and each poll
+    worker = FetchWorker(lambda: time.sleep(0.3) or [])
+    start = time.perf_counter()
+    worker.request()
+    request_ms = (time.perf_counter() - start) * 1000
+    longest_poll_ms = 0.0
+    while worker.busy:
+        start = time.perf_counter()
+        worker.poll()
+        longest_poll_ms = max(longest_poll_ms, (time.perf_counter() - start) * 1000)
+        time.sleep(0.01)
+    assert request_ms < 50 and longest_poll_ms < 50
+
+
+class _RacingWorker:
+    """Reports busy, then finishes during the drain that follows."""
+
+    def __init__(self, result):
+        self._busy = True
+        self._queued = []
+        self._result = result
+
+    @property
+    def busy(self):
+        return self._busy
+
+    def poll(self):
+        drained, self._queued = self._queued, []
+        if self._busy:
+            # Finished just after the queue was read
+            self._busy = False
+            self._queued = [self._result]
+        return drained
+
+
+class _StubApp:
+    def __init__(self, worker):
+        import main
+        self._poll_fetch = main.App._poll_fetch.__get__(self)
+        self._apply_fetch = main.App._apply_fetch.__get__(self)
+        self.fetch_worker = worker
+        self.profile = SimpleNamespace(marks={"first_refresh": 0.0})
+        self.scheduled = []
+        self.applied = []
+        self.latest_word = None
+        self.word_var = SimpleNamespace(set=lambda value: setattr(self, "word", value))
+        self.fetch_status_var = SimpleNamespace(set=lambda value: setattr(self, "status", value))
+
+    def after(self, ms, callback):
+        self.scheduled.append(callback)
+        return "after#1"
+
+    def _apply_feed(self, entries):
+        self.applied.append(entries)
+
+
+@pytest.fixture
+def stub_app():
+    pytest.importorskip("tkinter")
+    return _StubApp
+
+
+def test_result_queued_after_the_drain_is_still_applied(stub_app):
+    app = stub_app(_RacingWorker((["word"], None)))
+    app._poll_fetch()
+    assert app.applied == [] and len(app.scheduled) == 1
+    app.scheduled.pop()()
+    assert app.applied == [["word"]] and app.scheduled == []
+    assert app.status == ""
+
+
+def test_fetch_error_is_shown(stub_app):
+    app = stub_app(_RacingWorker((None, OSError("offline"))))
+    app._poll_fetch()
+    app.scheduled.pop()()
+    assert app.applied == []
+    assert app.status == "Refresh failed: offline"
+    assert app.word == "(no data)"
@@ -0,0 +1,70 @@
+import pytest
+
+import storage
+from fuzzy_index import TrigramIndex, edit_distance
+from word_entry import WordEntry
+
+
+def _entry(word: str, published_at: int = 1_700_000_000) -> WordEntry:
+    return WordEntry(word, "", "noun", "", "", "", "", "", "", "", published_at)
+
+
+@pytest.fixture
+def index() -> TrigramIndex:
+    index = TrigramIndex()
+    index.add_many((word.casefold(), word) for word in [
+        "Ember", "amber", "umber", "embers", "serendipity", "ephemeral", "ephemera", "glow",
+    ])
+    return index
+
+
+def test_edit_distance_stops_past_the_limit():
+    assert edit_distance("ember", "amber", 2) == 1
+    assert edit_distance("ember", "embers", 2) == 1
+    assert edit_distance("glow", "ember", 2) == 3
+    assert edit_distance("a", "abcdef", 2) == 3
+
+
+def test_typos_find_the_intended_word(index):
+    assert index.lookup("embr", 1) == ["Ember"]
+    assert index.lookup("serendipty", 1) == ["serendipity"]
+    assert index.lookup("ephemrael", 1) == ["ephemeral"]
+
+
+def test_exact_match_comes_first_then_nearest(index):
+    assert index.lookup("ember")[0] == "Ember"
+    assert set(index.lookup("ember")) == {"Ember", "amber", "umber", "embers"}
+    assert index.lookup("ephemeral", 2) == ["ephemeral", "ephemera"]
+
+
+def test_cutoff_depends_on_word_length(index):
+    # Short words allow one edit, so two typos find nothing
+    assert index.lookup("gluw") == ["glow"]
+    assert index.lookup("gluv") == []
+    # Words of 8 or more characters allow two
+    assert index.lookup("serendipyti") == ["serendipity"]
+    assert index.lookup("sxreneipyty") == []
+    assert index.lookup("gluv", max_distance=2) == ["glow"]
+    assert index.lookup("serendipyti", max_distance=1) == []
+
+
+@pytest.mark.parametrize("k", [1, 2, 3])
+def test_k_keeps_the_nearest(index, k):
+    assert index.lookup("embers", k) == index.lookup("embers", 10)[:k]
+
+
+def test_duplicate_keys_are_indexed_once(index):
+    assert index.add_many([("ember", "ember"), ("zephyr", "zephyr")]) == 1
+    assert index.lookup("zephir") == ["zephyr"]
+    assert index.lookup("", 5) == []
+
+
+def test_index_builds_in_the_background_and_follows_new_words(data_dir):
+    storage.add_history_many(_entry(f"word{i}", 1_700_000_000 - i) for i in range(20))
+    storage.toggle_favorite(_entry("serendipity"))
+    assert not storage.fuzzy_index_ready()
+    storage.warm_indexes().join(5)
+    assert storage.fuzzy_index_ready()
+    assert storage.fuzzy_lookup("serendipty", 1) == ["serendipity"]
+    storage.add_history_many([_entry("zephyr", 1_600_000_000)])
+    assert storage.fuzzy_lookup("Zephir", 1) == ["zephyr"]
@@ -0,0 +1,107 @@
+import json
+
+import pytest
+
+import storage
+import verba
+from word_entry import WordEntry
+
+# More than one ADD_BATCH, so imports are stored in several batches
+COUNT = 2500
+
+
+def _entry(i: int) -> WordEntry:
+    # Newest first: entry 0 has the latest date; every fifth shares its neighbour's
+    return WordEntry(f"word{i}", "", "noun", f"definition {i}", "", "", "", "", "", f"http://x/{i}", 1_800_000_000 - i // 5 * 5)
+
+
+@pytest.fixture(params=["json", "journal", "sqlite"])
+def repo(request, data_dir):
+    if request.param == "sqlite":
+        from sqlite_storage import SqliteRepository
+        storage._repo = SqliteRepository(data_dir / "wotd.db")
+    elif request.param == "journal":
+        from journal_storage import JournalRepository
+        storage._repo = JournalRepository(data_dir / "wotd.journal")
+    else:
+        storage._repo = storage.JsonRepository()
+    yield storage._repo
+    storage._repo.flush()
+    if request.param == "sqlite":
+        storage._repo.close()
+
+
+def _write_jsonl(path, entries) -> None:
+    with open(path, "w", encoding="utf-8") as out:
+        for entry in entries:
+            out.write(json.dumps(storage.entry_to_dict(entry)) + "\n")
+
+
+def test_import_and_export_stream_in_batches(repo, data_dir, monkeypatch):
+    source = data_dir / "in.jsonl"
+    entries = [_entry(i) for i in range(COUNT)]
+    _write_jsonl(source, entries + entries[:3])
+    batches = []
+    add_history_many = type(repo).add_history_many
+    monkeypatch.setattr(type(repo), "add_history_many", lambda self, batch: batches.append(len(batch)) or add_history_many(self, batch))
+
+    assert verba.main(["import", str(source)]) == 0
+    assert batches == [storage.ADD_BATCH, storage.ADD_BATCH, COUNT + 3 - 2 * storage.ADD_BATCH]
+    assert verba.main(["import", "--favorites", str(source)]) == 0
+
+    for flag, expected in (([], storage.get_history()), (["--favorites"], entries)):
+        target = data_dir / "out.jsonl"
+        assert verba.main(["export", *flag, "-o", str(target)]) == 0
+        exported = [json.loads(line)["word"] for line in target.read_text(encoding="utf-8").splitlines()]
+        assert exported == [entry.word for entry in expected]
+    assert [entry.word for entry in storage.get_history()] == [entry.word for entry in entries]
+    assert list(storage.iter_favorites()) == storage.get_favorites()
+
+
+def test_malformed_record_stores_nothing(repo, data_dir, capsys):
+    source = data_dir / "in.jsonl"
+    _write_jsonl(source, [_entry(i) for i in range(COUNT)])
+    with open(source, "a", encoding="utf-8") as out:
+        out.write("not json\n")
+    assert verba.main(["import", str(source)]) == 1
+    assert f"line {COUNT + 1}" in capsys.readouterr().err
+    assert storage.get_history() == []
+
+
+def test_iteration_continues_across_writes(repo):
+    storage.add_history_many(_entry(i) for i in range(COUNT))
+    walk = storage.iter_history()
+    first = next(walk)
+    assert first.word == "word0"
+    # A newer word goes in above the walk's position; the walk goes on undisturbed
+    storage.add_history_many([_entry(-1)])
+    storage.toggle_favorite(first)
+    words = [entry.word for entry in walk]
+    assert words == [f"word{i}" for i in range(1, COUNT)]
+    assert storage.get_history()[0].word == "word-1"
+
+
+def test_poisoned_records_are_rejected_before_storing(repo, data_dir, capsys):
+    published = "Sun, 05 Jan 2025 00:00:00 -0500"
+    source = data_dir / "in.jsonl"
+    # A published_at of the wrong type is parsed again from published
+    source.write_text(json.dumps({"word": "alpha", "published": published, "published_at": "1700000000"}) + "\n"
+                      + json.dumps({"word": "beta", "published_at": True}) + "\n", encoding="utf-8")
+    assert verba.main(["import", str(source)]) == 0
+    assert [(entry.word, entry.published_at) for entry in storage.get_history()] == [("alpha", 1736053200), ("beta", 0)]
+
+    for bad, field in (({"word": ["x"]}, "word"), ({"word": "gamma", "published": 5}, "published"),
+                       ({"word": "gamma", "definition": None}, "definition")):
+        source.write_text(json.dumps({"word": "delta"}) + "\n" + json.dumps(bad) + "\n", encoding="utf-8")
+        assert verba.main(["import", str(source)]) == 1
+        assert f"line 2: {field} must be a string" in capsys.readouterr().err
+    storage.flush()
+    assert [entry.word for entry in storage.get_history()] == ["alpha", "beta"]
+    assert verba.main(["list"]) == 0
+
+
+def test_csv_published_at_is_reparsed_when_not_a_number(repo, data_dir):
+    source = data_dir / "in.csv"
+    source.write_text("word,published,published_at\nalpha,\"Sun, 05 Jan 2025 00:00:00 -0500\",soon\n", encoding="utf-8")
+    assert verba.main(["import", str(source)]) == 0
+    assert storage.get_history()[0].published_at == 1736053200
@@ -0,0 +1,88 @@
+import json
+from pathlib import Path
+
+import pytest
+
+import journal_storage
+import storage
+from journal_storage import JournalRepository
+from word_entry import WordEntry
+
+
+def _entry(word: str, published_at: int = 1_700_000_000) -> WordEntry:
+    return WordEntry(word, "", "noun", f"definition of {word}", "", "", "", "", "", "", published_at)
+
+
+@pytest.fixture
+def journal(data_dir: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(journal_storage, "DATA_FILE", data_dir / "wotd.json")
+    return data_dir / "wotd.journal"
+
+
+def _words(repo: JournalRepository):
+    return [e.word for e in repo.get_history()]
+
+
+def test_torn_last_record_is_cut_and_appends_follow_the_good_ones(journal):
+    repo = JournalRepository(journal)
+    for i in range(3):
+        repo.add_history_many([_entry(f"word{i}", 1_700_000_000 - i)])
+    good = journal.stat().st_size
+    # A writer that crashed partway through its record
+    with journal.open("ab") as f:
+        f.write(b'{"seq": 4, "op": "history_add", "recor')
+
+    reopened = JournalRepository(journal)
+    assert _words(reopened) == ["word0", "word1", "word2"]
+    assert journal.stat().st_size == good
+    reopened.add_history_many([_entry("word3", 1_600_000_000)])
+    assert _words(JournalRepository(journal)) == ["word0", "word1", "word2", "word3"]
+
+
+@pytest.mark.parametrize("bad", [b"not json", b'["a list"]', b'{"op": "history_add"}', "café".encode("latin-1")])
+def test_corrupt_middle_record_is_skipped(journal, bad):
+    repo = JournalRepository(journal)
+    repo.add_history_many([_entry("before")])
+    repo.add_history_many([_entry("after", 1_600_000_000)])
+    repo.toggle_favorite(_entry("after", 1_600_000_000))
+    lines = journal.read_bytes().splitlines(keepends=True)
+    journal.write_bytes(b"".join([lines[0], bad + b"\n", *lines[1:]]))
+
+    reopened = JournalRepository(journal)
+    assert _words(reopened) == ["before", "after"]
+    assert [e.word for e in reopened.get_favorites()] == ["after"]
+    # Nothing good is cut off, so the next append is read back too
+    reopened.add_history_many([_entry("later", 1_500_000_000)])
+    assert _words(JournalRepository(journal)) == ["before", "after", "later"]
+
+
+def test_writer_catches_up_with_another_process(journal):
+    # Two repositories on one journal stand in for two processes
+    first = JournalRepository(journal)
+    second = JournalRepository(journal)
+    assert _words(first) == _words(second) == []
+    first.add_history_many([_entry("ember")])
+    second.add_history_many([_entry("glow", 1_600_000_000)])
+    assert _words(second) == ["ember", "glow"]
+    second.toggle_favorite(_entry("ember"))
+    # Toggled off by first, on top of second's toggle on
+    assert first.toggle_favorite(_entry("ember")) is False
+    assert _words(first) == ["ember", "glow"]
+    assert second.get_favorites() == [_entry("ember")]
+    second.add_history_many([_entry("coal", 1_500_000_000)])
+    assert second.get_favorites() == []
+
+
+def test_compaction_runs_in_the_background(journal, monkeypatch):
+    monkeypatch.setattr(journal_storage, "JOURNAL_COMPACT_BYTES", 1024)
+    repo = JournalRepository(journal)
+    for i in range(10):
+        repo.add_history_many([_entry(f"word{i}", 1_700_000_000 - i)])
+    compactor = repo._compactor
+    assert compactor is not None and compactor.name == "verba-compact"
+    repo.flush()
+    assert not compactor.is_alive()
+    snapshot = json.loads(storage.DATA_FILE.read_text(encoding="utf-8"))
+    assert journal.stat().st_size < 1024
+    assert snapshot["journal_seq"] >= 1
+    assert _words(JournalRepository(journal)) == [f"word{i}" for i in range(10)]
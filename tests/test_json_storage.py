@@ -0,0 +1,65 @@
+import json
+import threading
+
+import pytest
+
+import storage
+from word_entry import WordEntry
+
+
+def _entry(word: str, published_at: int = 1_700_000_000) -> WordEntry:
+    return WordEntry(word, "", "noun", f"definition of {word}", "", "", "", "", "", "", published_at)
+
+
+def test_flush_serializes_without_blocking_mutations(data_dir, monkeypatch):
+    storage.add_history_many([_entry("ember")])
+    serializing = threading.Event()
+    release = threading.Event()
+    serialize = storage._serialize
+
+    def slow_serialize(data):
+        serializing.set()
+        assert release.wait(5)
+        return serialize(data)
+
+    monkeypatch.setattr(storage, "_serialize", slow_serialize)
+    flusher = threading.Thread(target=storage.flush)
+    flusher.start()
+    assert serializing.wait(5)
+    # Taken while the first write is still being serialized
+    storage.add_history_many([_entry("glow", 1_600_000_000)])
+    assert [e.word for e in storage.get_history()] == ["ember", "glow"]
+    release.set()
+    flusher.join(5)
+
+    # The first write holds the snapshot taken before the mutation; the next flush adds it
+    assert [r["word"] for r in json.loads(storage.DATA_FILE.read_text(encoding="utf-8"))["history"]] == ["ember"]
+    storage.flush()
+    assert [r["word"] for r in json.loads(storage.DATA_FILE.read_text(encoding="utf-8"))["history"]] == ["glow", "ember"]
+
+
+def test_concurrent_writes_of_one_path_each_land_whole(tmp_path):
+    path = tmp_path / "out.json"
+    texts = [json.dumps({"writer": n, "pad": "x" * 200_000}) for n in range(8)]
+    threads = [threading.Thread(target=storage.write_text, args=(text, path)) for text in texts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert path.read_text(encoding="utf-8") in texts
+    # No temporary file is left behind
+    assert [p.name for p in tmp_path.iterdir()] == ["out.json"]
+
+
+def test_failed_write_keeps_the_old_file(tmp_path, monkeypatch):
+    path = tmp_path / "out.json"
+    storage.write_text("old", path)
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(storage.os, "fsync", fail)
+    with pytest.raises(OSError):
+        storage.write_text("new", path)
+    assert path.read_text(encoding="utf-8") == "old"
+    assert [p.name for p in tmp_path.iterdir()] == ["out.json"]
@@ -0,0 +1,141 @@
+"""Differential test of rss_client._parse_description against the parser it replaced.
+
+_reference_parse is the section-by-section parser from before the
+one-pass marker scan, kept verbatim apart from names. Both must agree on
+every description of the saved feed sample, on hand-written edge cases,
+and on seeded mutations of the sample.
+"""
+import html
+import random
+import re
+import xml.etree.ElementTree as ET
+
+import pytest
+
+import rss_client
+from conftest import DATA_SAMPLES
+
+SECTIONS = ("pronunciation", "part_of_speech", "definition", "usage_example", "examples", "did_you_know")
+
+
+def _reference_strip_html(text: str) -> str:
+    text = re.sub(r"<a[^>]*>([^<]*)</a>", r"\1", text)
+    plain = re.sub(r"<[^>]+>", "", text)
+    plain = re.sub(r"https?://\S+", "", plain)
+    return html.unescape(plain).strip()
+
+
+def _reference_extract_section(text: str, start_marker: str, end_markers: list) -> str:
+    start_idx = text.find(start_marker)
+    if start_idx == -1:
+        return ""
+    start_idx += len(start_marker)
+    end_idx = len(text)
+    for marker in end_markers:
+        idx = text.find(marker, start_idx)
+        if idx != -1 and idx < end_idx:
+            end_idx = idx
+    return text[start_idx:end_idx].strip()
+
+
+def _reference_parse(raw: str) -> dict:
+    result = dict.fromkeys(SECTIONS, "")
+    pronunciation_match = re.search(r"\\([^\\]+)\\", raw)
+    if pronunciation_match:
+        result["pronunciation"] = pronunciation_match.group(1).strip()
+    pos_match = re.search(r"\\[^\\]+\\[^<]*<em>([^<]+)</em>", raw)
+    if pos_match:
+        result["part_of_speech"] = pos_match.group(1).strip()
+    def_match = re.search(r"</em><br\s*/?>.*?<p>(.+?)</p>", raw, re.DOTALL)
+    if def_match:
+        result["definition"] = _reference_strip_html(def_match.group(1))
+    usage_match = re.search(r"<p>\s*//\s*(.+?)</p>", raw, re.DOTALL)
+    if usage_match:
+        result["usage_example"] = _reference_strip_html(usage_match.group(1))
+    examples = _reference_extract_section(raw, "<strong>Examples:</strong>", ["<strong>Did you know?"])
+    if examples:
+        result["examples"] = _reference_strip_html(examples)
+    dyk = _reference_extract_section(raw, "<strong>Did you know?</strong>", ["<br /><br />", "</font>"])
+    if dyk:
+        result["did_you_know"] = _reference_strip_html(dyk)
+    return result
+
+
+def _sample_descriptions() -> list:
+    root = ET.parse(DATA_SAMPLES / "wotd_feed.xml").getroot()
+    return [item.findtext("description") for item in root.iter("item")]
+
+
+HEAD = "<p><strong>word</strong> \\WURD\\ <em>noun</em><br />\n"
+
+EDGE_CASES = [
+    "",
+    "plain text, no markup",
+    HEAD,
+    HEAD + "<p>definition only</p>",
+    # Did-you-know ended by the double break that follows an </em>
+    HEAD + "<p>def</p><p><strong>Did you know?</strong></p><p>The <em>word</em><br /><br />tail</p>",
+    # Usage paragraph after the did-you-know terminator
+    HEAD + "<p>def</p><p><strong>Did you know?</strong> text<br /><br /></p><p>// usage later</p>",
+    HEAD + "<p>def</p><p><strong>Did you know?</strong> text</font><p>// usage after font</p>",
+    "<p><strong>w</strong> \\w\\ <em>verb</em><br/><p>def</p>",
+    "<p><strong>w</strong> \\w\\ <em>verb</em><br>\n\n<p>def across\nlines</p>",
+    "<em>verb</em><br /><p></p><p>second</p>",
+    "<p>// usage first</p></em><br /><p>def after usage</p>",
+    HEAD + "<p>def</p><p><strong>Examples:</strong></p><p>ex only, no did-you-know</p>",
+    HEAD + "<p><strong>Did you know?</strong></p><p>before</p><p><strong>Examples:</strong></p><p>after</p>",
+    HEAD + "<p><strong>Did you know?</p><p>no closing strong</p><strong>Did you know?</strong> real",
+    HEAD + "<p><strong>Examples:</strong> one <strong>Examples:</strong> two <strong>Did you know?</strong> dyk",
+    HEAD + "<p>def <a href=\"https://example.com/x\">link</a> https://example.com/y</p><p>//   spaced usage </p>",
+    HEAD + "</em><br /><br /><p>double break right after the head</p>",
+    "<p><strong>Did you know?</strong></p><p>dyk with no head</p><br /><br /><p>// usage</p>",
+    HEAD + "<p>def</p>\r\n<p>// usage with CRLF\r\n</p>\r\n<p><strong>Did you know?</strong></p><p>&amp; entities</p></font>",
+]
+
+
+def _mutations(count: int, seed: int = 9) -> list:
+    """Sample descriptions with markers inserted, removed or duplicated at random."""
+    rng = random.Random(seed)
+    snippets = [
+        "<br /><br />", "</font>", "</em><br />", "<p>", "</p>", "<p>// usage</p>",
+        "<strong>Did you know?</strong>", "<strong>Did you know?", "<strong>Examples:</strong>",
+        "<em>x</em><br /><br />", "<p></p>", "\\pron\\",
+    ]
+    samples = _sample_descriptions()
+    cases = []
+    for _ in range(count):
+        text = rng.choice(samples)
+        for _ in range(rng.randint(1, 4)):
+            action = rng.random()
+            at = rng.randrange(len(text) + 1)
+            if action < 0.6:
+                text = text[:at] + rng.choice(snippets) + text[at:]
+            elif action < 0.8:
+                text = text[:at] + text[at + rng.randint(1, 40):]
+            else:
+                text = text[:at] + text[at:at + rng.randint(1, 200)] + text[at:]
+        cases.append(text)
+    return cases
+
+
+@pytest.mark.parametrize("raw", _sample_descriptions())
+def test_matches_reference_on_feed_sample(raw):
+    parsed = rss_client._parse_description(raw)
+    assert parsed == _reference_parse(raw)
+    assert all(parsed[section] for section in SECTIONS)
+
+
+@pytest.mark.parametrize("raw", EDGE_CASES)
+def test_matches_reference_on_edge_cases(raw):
+    assert rss_client._parse_description(raw) == _reference_parse(raw)
+
+
+def test_matches_reference_on_mutated_samples():
+    for raw in _mutations(2000):
+        assert rss_client._parse_description(raw) == _reference_parse(raw), raw
+
+
+def test_reported_regressions():
+    dyk = rss_client._parse_description(EDGE_CASES[4])["did_you_know"]
+    assert dyk == "The word"
+    assert rss_client._parse_description(EDGE_CASES[5])["usage_example"] == "usage later"
@@ -0,0 +1,118 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import perf
+
+
+def _true_percentile(values, q):
+    ordered = sorted(values)
+    return ordered[max(0, -(-len(ordered) * q // 100) - 1)]
+
+
+@pytest.mark.parametrize("values", [
+    [5.0],
+    [float(n) for n in range(1, 1001)],
+    [0.25, 0.3, 7.0, 7.5, 300.0, 4096.0, 4097.0],
+    [n / 7 for n in range(1, 200)],
+])
+@pytest.mark.parametrize("q", [0, 1, 50, 90, 99, 100])
+def test_percentile_is_an_upper_bound_within_2x(values, q):
+    histogram = perf.Histogram()
+    for value in values:
+        histogram.add(value)
+    estimate = histogram.percentile(q)
+    exact = _true_percentile(values, q)
+    assert exact <= estimate <= min(2 * exact, max(values))
+
+
+def test_histogram_summary():
+    histogram = perf.Histogram()
+    for value in (1.0, 2.0, 3.0, 10.0):
+        histogram.add(value)
+    summary = histogram.to_dict()
+    assert summary["count"] == 4 and summary["mean"] == 4.0
+    assert summary["min"] == 1.0 and summary["max"] == 10.0
+    assert summary["p99"] == 10.0
+
+
+@pytest.fixture
+def perf_on(tmp_path, monkeypatch):
+    """Turn instrumentation on, logging to a fresh perf.jsonl."""
+    monkeypatch.setattr(perf, "ENABLED", True)
+    monkeypatch.setattr(perf, "PERF_LOG_FILE", tmp_path / "perf.jsonl")
+    monkeypatch.setattr(perf, "_log", None)
+    monkeypatch.setattr(perf, "_counters", {})
+    monkeypatch.setattr(perf, "_histograms", {})
+    return tmp_path / "perf.jsonl"
+
+
+def _records(path: Path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_disabled_instrumentation_is_a_no_op(monkeypatch, tmp_path):
+    monkeypatch.setattr(perf, "ENABLED", False)
+    monkeypatch.setattr(perf, "PERF_LOG_FILE", tmp_path / "perf.jsonl")
+
+    def func():
+        return 42
+
+    assert perf.timed("test.func")(func) is func
+    assert perf.timed("test.func", log=False)(func) is func
+    with perf.span("test.span"):
+        perf.count("test.count")
+        perf.observe("test.observe", 1.0)
+    perf.write_summary()
+    assert not (tmp_path / "perf.jsonl").exists()
+
+
+def test_spans_counters_and_summary_are_logged(perf_on):
+    @perf.timed("test.func")
+    def func(x):
+        return x * 2
+
+    assert func(21) == 42
+    with pytest.raises(KeyError):
+        with perf.span("test.span", size=3):
+            raise KeyError("x")
+    perf.count("test.count", 2)
+    perf.observe("test.bytes", 100)
+    perf.write_summary()
+
+    spans, failed, summary = _records(perf_on)
+    assert spans["name"] == "test.func" and spans["pid"] == os.getpid()
+    assert failed["name"] == "test.span" and failed["size"] == 3 and failed["error"] == "KeyError"
+    assert summary["type"] == "summary"
+    assert summary["counters"] == {"test.count": 2}
+    assert set(summary["histograms"]) == {"test.func", "test.span", "test.bytes"}
+
+
+def test_processes_share_the_rotating_log(tmp_path):
+    # Each worker writes 300 spans to a log that rotates every 4 KB
+    code = (
+        "import perf\n"
+        "perf.PERF_LOG_BYTES = 4096\n"
+        "for i in range(300):\n"
+        "    with perf.span('test.worker', i=i, pad='x' * 40):\n"
+        "        pass\n"
+    )
+    env = {**os.environ, "VERBA_PERF": "1", "VERBA_DATA_DIR": str(tmp_path), "PYTHONPATH": str(Path(perf.__file__).parent)}
+    workers = [subprocess.Popen([sys.executable, "-c", code], env=env) for _ in range(4)]
+    assert [worker.wait() for worker in workers] == [0] * 4
+
+    logs = sorted(tmp_path.glob("perf.jsonl*"))
+    assert [path.name for path in logs] == ["perf.jsonl"] + [f"perf.jsonl.{n}" for n in range(1, perf.PERF_LOG_BACKUPS + 1)]
+    for path in logs:
+        # Whole lines only, and no file grew far past the limit
+        records = _records(path)
+        assert all(record["type"] in ("span", "summary") for record in records)
+        assert path.stat().st_size < 4096 + 4 * 1024
+    # The newest spans are in the current log, or in the one before if the
+    # workers' exit summaries alone filled the current one since
+    spans = [record["i"] for path in logs[:2] for record in _records(path) if record["type"] == "span"]
+    assert max(spans) == 299
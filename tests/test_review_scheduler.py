@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from review_scheduler import (
+    DAY, GRADE_AGAIN, GRADE_EASY, GRADE_GOOD, GRADE_HARD, MIN_EASE, RELEARN_DELAY, CardState, ReviewScheduler, sm2,
+)
+
+NOW = 1_700_000_000.0
+
+
+def test_passing_grades_grow_the_interval():
+    first = sm2(CardState(), GRADE_GOOD, NOW)
+    assert first == CardState(2.5, 1, 1, NOW + DAY)
+    second = sm2(first, GRADE_GOOD, NOW)
+    assert (second.interval, second.repetitions, second.due) == (6, 2, NOW + 6 * DAY)
+    # From the third review on, the interval grows by the ease before this review
+    third = sm2(CardState(2.6, 6, 2), GRADE_HARD, NOW)
+    assert (third.interval, third.repetitions) == (16, 3)
+
+
+@pytest.mark.parametrize("grade, ease", [(GRADE_EASY, 2.6), (GRADE_GOOD, 2.5), (GRADE_HARD, 2.36), (GRADE_AGAIN, 1.96)])
+def test_every_grade_adjusts_the_ease(grade, ease):
+    assert sm2(CardState(), grade, NOW).ease == pytest.approx(ease)
+
+
+@pytest.mark.parametrize("grade", [0, GRADE_AGAIN, 2])
+def test_failing_grade_restarts_the_card_within_the_session(grade):
+    state = sm2(CardState(2.5, 15, 3, NOW), grade, NOW)
+    assert (state.interval, state.repetitions, state.due) == (0, 0, NOW + RELEARN_DELAY)
+    # Relearning starts over at one day
+    assert sm2(state, GRADE_GOOD, NOW).interval == 1
+
+
+def test_ease_never_drops_below_the_floor():
+    state = CardState(1.4, 6, 2)
+    for grade in (GRADE_AGAIN, 0, GRADE_HARD):
+        state = sm2(state, grade, NOW)
+        assert state.ease == MIN_EASE
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    return ReviewScheduler(tmp_path / "reviews.json")
+
+
+def test_next_card_is_the_one_due_soonest(scheduler):
+    assert scheduler.next_card() == (None, None)
+    scheduler.sync(["a", "b", "c"], now=NOW)
+    # New cards are due at once, in the order given
+    assert scheduler.next_card() == ("a", NOW)
+    scheduler.grade("a", GRADE_GOOD, now=NOW)
+    assert scheduler.next_card() == ("b", NOW)
+    scheduler.grade("b", GRADE_EASY, now=NOW)
+    scheduler.grade("c", GRADE_AGAIN, now=NOW)
+    assert scheduler.next_card() == ("c", NOW + RELEARN_DELAY)
+    # Regrading leaves the old heap item behind; it is skipped
+    scheduler.grade("c", GRADE_GOOD, now=NOW)
+    assert scheduler.next_card() == ("a", NOW + DAY)
+    assert scheduler.due_count(NOW + DAY - 1) == 0
+    assert scheduler.due_count(NOW + DAY) == 3
+    scheduler.save()
+
+
+def test_sync_adds_and_removes_cards_keeping_their_state(scheduler, tmp_path):
+    scheduler.sync(["a", "b"], now=NOW)
+    graded = scheduler.grade("a", GRADE_GOOD, now=NOW)
+    scheduler.sync(["b", "c"], now=NOW)
+    assert len(scheduler) == 2
+    assert scheduler.state("a") is None
+    assert scheduler.state("c") == CardState(due=NOW)
+    # a's stale heap item is not handed out
+    assert scheduler.next_card() == ("b", NOW)
+    scheduler.grade("b", GRADE_GOOD, now=NOW)
+    scheduler.grade("c", GRADE_GOOD, now=NOW + 1)
+    assert scheduler.next_card() == ("b", NOW + DAY)
+
+    # A card back in the deck resumes where it was
+    scheduler.sync(["a", "b", "c"], now=NOW)
+    assert scheduler.state("a") == graded
+    # a and b; c was graded a second later
+    assert scheduler.due_count(NOW + DAY) == 2
+
+
+def test_graded_cards_are_saved_and_restored(scheduler, tmp_path):
+    scheduler.sync(["a", "b", "c"], now=NOW)
+    scheduler.grade("a", GRADE_GOOD, now=NOW)
+    scheduler.sync(["b"], now=NOW)
+    scheduler.grade("b", GRADE_AGAIN, now=NOW)
+    scheduler.save()
+    # Removed cards are saved with the rest; never graded ones are not
+    assert set(json.loads((tmp_path / "reviews.json").read_text(encoding="utf-8"))["cards"]) == {"a", "b"}
+
+    reloaded = ReviewScheduler(tmp_path / "reviews.json")
+    reloaded.sync(["a", "b", "c"], now=NOW + 5)
+    assert reloaded.state("a") == CardState(2.5, 1, 1, NOW + DAY)
+    assert reloaded.state("b") == scheduler.state("b")
+    assert reloaded.state("c") == CardState(due=NOW + 5)
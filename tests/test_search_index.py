@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+import storage
+from search_index import SearchIndex
+from word_entry import WordEntry
+
+
+def _entry(word: str, definition: str = "", usage: str = "", published_at: int = 1_700_000_000) -> WordEntry:
+    return WordEntry(word, "", "noun", definition, "", usage, "", "", "", "", published_at)
+
+
+@pytest.fixture
+def index() -> SearchIndex:
+    index = SearchIndex()
+    index.add_many((e.word, e) for e in [
+        _entry("ember", "a glowing piece of coal"),
+        _entry("glow", "to shine with steady light"),
+        _entry("coal", "a black rock that burns", "the glowing coal"),
+        _entry("glower", "to look angrily"),
+        _entry("gloaming", "twilight, when the light glows low"),
+    ])
+    return index
+
+
+def test_word_matches_outrank_definition_and_usage_matches(index):
+    assert index.search("coal") == ["coal", "ember"]
+    # glow is the word itself; gloaming only mentions it
+    assert index.search("glow")[0] == "glow"
+
+
+def test_last_term_matches_as_a_prefix(index):
+    assert set(index.search("glo")) == {"glow", "glower", "gloaming", "ember", "coal"}
+    assert index.search("glowe") == ["glower"]
+    # Earlier terms must match whole
+    assert index.search("glo light") == []
+    assert index.search("light glo") == ["glow", "gloaming"]
+
+
+def test_every_term_must_match(index):
+    assert index.search("coal glowing") == ["coal", "ember"]
+    assert index.search("coal twilight") == []
+    assert index.search("   ") == []
+
+
+@pytest.mark.parametrize("query", ["glo", "glow", "coal glowing", "light"])
+@pytest.mark.parametrize("limit", [1, 2, 10])
+def test_limit_returns_the_best_matches(index, query, limit):
+    assert index.search(query, limit) == index.search(query)[:limit]
+
+
+def test_saved_index_answers_the_same(index):
+    loaded = SearchIndex.from_dict(json.loads(json.dumps(index.to_dict())))
+    assert loaded.keys() == index.keys()
+    for query in ("glo", "coal glowing", "light"):
+        assert loaded.search(query) == index.search(query)
+
+
+def test_index_warms_in_the_background_and_saves_only_larger_changes(data_dir, monkeypatch):
+    monkeypatch.setattr(storage, "SEARCH_INDEX_SAVE_MIN", 10)
+    storage.add_history_many(_entry(f"word{i}", f"definition {i}", published_at=1_700_000_000 - i) for i in range(20))
+    assert not storage.search_index_ready()
+    storage.warm_indexes().join(5)
+    assert storage.search_index_ready()
+    assert [e.word for e in storage.search_history("word7")] == ["word7"]
+    # Built from scratch, so written from the indexing thread
+    saved = storage.SEARCH_INDEX_FILE.stat().st_mtime_ns
+
+    # A few new words are indexed, but not worth rewriting the file for
+    storage.add_history_many([_entry("zephyr", "a gentle breeze")])
+    storage.flush()
+    assert storage.SEARCH_INDEX_FILE.stat().st_mtime_ns == saved
+    assert [e.word for e in storage.search_history("breeze")] == ["zephyr"]
+
+    # Reloaded, the saved index catches up from history
+    monkeypatch.setattr(storage, "_search", None)
+    assert [e.word for e in storage.search_history("breeze")] == ["zephyr"]
+
+    storage.add_history_many(_entry(f"extra{i}", published_at=1_600_000_000 - i) for i in range(10))
+    storage.flush()
+    assert storage.SEARCH_INDEX_FILE.stat().st_mtime_ns != saved
+    assert len(json.loads(storage.SEARCH_INDEX_FILE.read_text(encoding="utf-8"))["keys"]) == 31
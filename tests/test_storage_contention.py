@@ -0,0 +1,96 @@
+"""Several processes writing one data directory at once, on each backend.
+
+The workers are separate interpreters running _worker, started together
+and released at the same moment, the way overlapping verba commands and
+the GUI would write.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import storage
+from word_entry import WordEntry
+
+TESTS_DIR = Path(__file__).resolve().parent
+PROCESSES = 6
+TOGGLES = 20
+# Longest a write may wait for another process's file lock
+LOCK_WAIT_BUDGET = 1.0
+# Toggled by every worker, each time saved at once; worker n toggles it
+# COMMON_TOGGLES + n times
+COMMON_WORD = "common"
+COMMON_TOGGLES = 40
+
+
+def _entry(name: str) -> WordEntry:
+    return WordEntry(name, "", "noun", f"definition of {name}", "", "", "", "", "Sun, 05 Jan 2025 00:00:00 -0500", "")
+
+
+def _worker(worker: int) -> None:
+    """Save TOGGLES changes the way separate commands would; print the lock waits as JSON.
+
+    Each of the worker's own words is favorited and written, and every
+    third is unfavorited again. All workers add the same history words,
+    then toggle COMMON_WORD.
+    """
+    entries = [_entry(f"p{worker}w{i}") for i in range(TOGGLES)]
+    print("ready", flush=True)
+    sys.stdin.readline()
+    for i, entry in enumerate(entries):
+        storage.add_history_many([_entry(f"shared{i}")])
+        storage.toggle_favorite(entry)
+        if i % 3 == 0:
+            storage.flush()
+            storage.toggle_favorite(entry)
+        storage.flush()
+    for _ in range(COMMON_TOGGLES + worker):
+        storage.toggle_favorite(_entry(COMMON_WORD))
+        storage.flush()
+    # SQLite waits in its own busy handler, which is not measured
+    lock = getattr(storage._repository(), "_file_lock", None)
+    print(json.dumps({"wait_max": lock.wait_max if lock else None}))
+
+
+def _report() -> None:
+    print(json.dumps({
+        "history": [entry.word for entry in storage.get_history()],
+        "favorites": [entry.word for entry in storage.get_favorites()],
+    }))
+
+
+@pytest.mark.parametrize("backend", ["json", "journal", "sqlite"])
+def test_concurrent_writers_lose_no_updates(backend, tmp_path):
+    env = {
+        **os.environ,
+        "VERBA_DATA_DIR": str(tmp_path),
+        "VERBA_STORAGE": backend,
+        "PYTHONPATH": os.pathsep.join([str(TESTS_DIR), str(Path(storage.__file__).parent)]),
+    }
+
+    def run(code: str, **kwargs) -> "subprocess.Popen[str]":
+        return subprocess.Popen([sys.executable, "-c", f"import {__name__} as t; {code}"],
+                                env=env, stdout=subprocess.PIPE, text=True, **kwargs)
+
+    workers = [run(f"t._worker({n})", stdin=subprocess.PIPE) for n in range(PROCESSES)]
+    for worker in workers:
+        assert worker.stdout.readline() == "ready\n"
+    for worker in workers:
+        worker.stdin.write("go\n")
+        worker.stdin.flush()
+    stats = [json.loads(worker.communicate()[0]) for worker in workers]
+    assert [worker.returncode for worker in workers] == [0] * PROCESSES
+
+    final = json.loads(run("t._report()").communicate()[0])
+    history, favorites = final["history"], final["favorites"]
+    assert sorted(history) == sorted(f"shared{i}" for i in range(TOGGLES))
+    own = sorted(f"p{n}w{i}" for n in range(PROCESSES) for i in range(TOGGLES) if i % 3)
+    assert sorted(word for word in favorites if word != COMMON_WORD) == own
+    # Every toggle of the shared word counts: it is a favorite if it was toggled an odd number of times
+    common_toggles = sum(COMMON_TOGGLES + n for n in range(PROCESSES))
+    assert favorites.count(COMMON_WORD) == common_toggles % 2
+    if backend != "sqlite":
+        assert max(stat["wait_max"] for stat in stats) <= LOCK_WAIT_BUDGET
@@ -0,0 +1,52 @@
+"""Memory cost of a loaded history, measured with tracemalloc."""
+import gc
+import json
+import tracemalloc
+
+import storage
+
+# Memory a loaded history entry may cost
+ENTRY_BYTES_BUDGET = 1000
+ENTRY_COUNT = 100_000
+
+
+def _document(count: int) -> str:
+    """A wotd.json of count synthetic entries sized like saved ones; a tenth are also favorites."""
+    speech = ("noun", "verb", "adjective", "adverb")
+    records = [
+        {
+            "word": f"word{i}",
+            "pronunciation": f"\\WURD-{i}\\",
+            "part_of_speech": speech[i % len(speech)],
+            "definition": f"the {i}th sample definition, about as long as a real one",
+            "short_definition": "",
+            "usage_example": f"She used word{i} in a sentence of usual length.",
+            "examples": "",
+            "did_you_know": "",
+            "published": f"Sun, 05 Jan 2025 00:00:{i % 60:02d} -0500",
+            "link": f"https://www.merriam-webster.com/word-of-the-day/word{i}-2025-01-05",
+            # Saved records carry the parsed date
+            "published_at": 1736053200 + i % 60,
+        }
+        for i in range(count)
+    ]
+    return json.dumps({"history": records, "favorites": records[:count // 10]})
+
+
+def test_entry_memory_within_budget(data_dir):
+    text = _document(ENTRY_COUNT)
+    gc.collect()
+    # The document is parsed inside the trace, as a real load would, and
+    # only what stays alive after indexing is counted
+    tracemalloc.start()
+    try:
+        repo = storage.JsonRepository()
+        repo._populate(json.loads(text))
+        gc.collect()
+        current = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert len(repo.get_history()) == ENTRY_COUNT
+    assert len(repo.get_favorites()) == ENTRY_COUNT // 10
+    per_entry = current / ENTRY_COUNT
+    assert per_entry <= ENTRY_BYTES_BUDGET, f"{per_entry:.0f} bytes per entry"
@@ -0,0 +1,22 @@
+import pytest
+
+import backfill
+import verba
+
+
+@pytest.mark.parametrize("argv", [
+    ["--workers", "2", "2026-01-01", "2026-01-02"],
+    ["2026-01-01", "--rate", "0.5", "2026-01-02", "--workers", "2"],
+    ["--help"],
+])
+def test_backfill_arguments_are_forwarded_in_any_order(argv, monkeypatch):
+    received = []
+    monkeypatch.setattr(backfill, "main", received.append)
+    assert verba.main(["backfill", *argv]) == 0
+    assert received == [argv]
+
+
+def test_unknown_arguments_of_other_commands_are_rejected(capsys):
+    with pytest.raises(SystemExit):
+        verba.main(["list", "--workers", "2"])
+    assert "unrecognized arguments: --workers 2" in capsys.readouterr().err
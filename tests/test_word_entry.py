@@ -0,0 +1,20 @@
+import pytest
+
+from word_entry import WordEntry, published_date
+
+
+def _entry(published: str) -> WordEntry:
+    return WordEntry("word", "", "noun", "", "", "", "", "", published, "")
+
+
+@pytest.mark.parametrize("published, shown", [
+    ("Sun, 05 Jan 2025 00:00:00 -0500", "05 Jan 2025"),
+    # The day of the pubDate's own zone, not the UTC one
+    ("Mon, 20 Jan 2025 23:30:00 -0500", "20 Jan 2025"),
+    ("Mon, 20 Jan 2025 00:30:00 +0900", "20 Jan 2025"),
+    ("20 Jan 2025 12:00 GMT", "20 Jan 2025"),
+    ("sometime in January", "sometime in January"),
+    ("", ""),
+])
+def test_published_date_shows_the_feeds_own_day(published, shown):
+    assert published_date(_entry(published)) == shown